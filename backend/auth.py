@@ -1,21 +1,123 @@
-from db.database import Database
+import asyncio
 import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
-from datetime import datetime, timedelta, timezone
+from db.database import Database, db
+from db.user import get_user
+from models.schemas import UserOut
+from utils.cache import TTLCache
+from utils.user import prepare_user
+
+class HashingOverloaded(Exception):
+    pass
+
+@lru_cache(maxsize=None)
+def get_crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+def hash_password(password: str, rounds: int) -> str:
+    return get_crypt_context(rounds).hash(password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    return get_crypt_context(rounds).verify_and_update(plain_password, hashed_password)
+
+class PasswordHasher:
+    def __init__(self, config: dict):
+        self.executor_type = config.get("executor", "thread")
+        self.max_workers = config.get("max_workers", 4)
+        self.max_queue = config.get("max_queue", 64)
+        self.rounds = config.get("bcrypt_rounds", 12)
+        self.executor: Executor | None = None
+        self.semaphore = asyncio.Semaphore(self.max_workers)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            if self.executor_type == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self.executor
+
+    async def run(self, func, *args):
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HashingOverloaded("Too many pending password operations")
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started_at = time.perf_counter()
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+            self.completed += 1
+            self.wait_seconds += started_at - queued_at
+            self.run_seconds += time.perf_counter() - started_at
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password, self.rounds)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self.run(verify_and_update_password, plain_password, hashed_password, self.rounds)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "maxWorkers": self.max_workers,
+            "maxQueue": self.max_queue,
+            "bcryptRounds": self.rounds,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "averageWaitMs": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "averageRunMs": round(self.run_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
 
 class AuthService:
     def __init__(self, config_path: str, db: Database):
         with open(config_path, "r") as config_file:
-            self.config = json.load(config_file)['jwt']
+            config = json.load(config_file)
+        self.config = config['jwt']
         self.db = db
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.hasher = PasswordHasher(config.get('hashing', {}))
+        cache_config = config.get('auth_cache', {})
+        self.token_cache = TTLCache(cache_config.get("token_cache_size", 10000), cache_config.get("token_cache_ttl", 300))
+        self.user_cache = TTLCache(cache_config.get("user_cache_size", 10000), cache_config.get("user_cache_ttl", 30))
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_and_update_password(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self.hasher.verify_and_update(plain_password, hashed_password)
 
-    def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
     def create_jwt(self, username: str, user_role: str, student_id: str = None, teacher_id: str = None) -> str:
         expiration = datetime.now(timezone.utc) + timedelta(days=self.config["jwt_expiration_days"])
@@ -28,4 +130,67 @@ class AuthService:
 
     def decode_token(self, token: str) -> dict:
         payload = jwt.decode(token, self.config["jwt_secret_key"], algorithms=[self.config["jwt_algorithm"]])
-        return payload
\ No newline at end of file
+        return payload
+
+    def verify_token(self, token: str) -> dict:
+        payload = self.token_cache.get(token)
+        if payload is None:
+            payload = self.decode_token(token)
+            self.token_cache.set(token, payload, payload["exp"] - time.time())
+        return payload
+
+    async def get_user(self, username: str) -> UserOut | None:
+        user = self.user_cache.get(username)
+        if user is None:
+            async with self.db.acquire(primary=True) as conn:
+                row = await get_user(conn, username)
+            if row is None:
+                return None
+            user = prepare_user(row)
+            self.user_cache.set(username, user)
+        return user
+
+    def invalidate_user(self, username: str = None):
+        if username is None:
+            self.user_cache.clear()
+        else:
+            self.user_cache.pop(username)
+
+auth_service = AuthService(config_path="config.json", db=db)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme)) -> UserOut:
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        payload = auth_service.verify_token(credentials.credentials)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
+    user = await auth_service.get_user(payload["username"])
+    if user is None:
+        raise HTTPException(status_code=401, detail="User no longer exists", headers={"WWW-Authenticate": "Bearer"})
+    return user
+
+async def get_optional_user(credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme)) -> UserOut | None:
+    # For public endpoints that do more for a signed-in caller. A missing or
+    # stale token means anonymous, not 401.
+    if credentials is None:
+        return None
+    try:
+        return await get_current_user(credentials)
+    except HTTPException:
+        return None
+
+def require_roles(*roles: str):
+    async def check_role(user: UserOut = Depends(get_current_user)) -> UserOut:
+        if user.role not in roles:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return user
+    return check_role
+
+require_admin = require_roles("admin")
+
+def ensure_student_access(user: UserOut, student_id: str):
+    if user.role == "student" and user.student_id != student_id:
+        raise HTTPException(status_code=403, detail="Students can only access their own records")
@@ -0,0 +1,26 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import auth_service
+from models.schemas import UserOut
+
+ITERATIONS = 100000
+
+def report(name: str, seconds: float, iterations: int):
+    print(f"{name:<32} {seconds / iterations * 1e6:8.2f} us/op")
+
+def main():
+    token = auth_service.create_jwt("bench", "admin")
+    auth_service.user_cache.set("bench", UserOut(username="bench", role="admin"))
+
+    report("jwt decode (uncached)", timeit.timeit(lambda: auth_service.decode_token(token), number=ITERATIONS // 10), ITERATIONS // 10)
+    auth_service.verify_token(token)
+    report("verify_token (cached)", timeit.timeit(lambda: auth_service.verify_token(token), number=ITERATIONS), ITERATIONS)
+    report("user row lookup (cached)", timeit.timeit(lambda: auth_service.user_cache.get("bench"), number=ITERATIONS), ITERATIONS)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import httpx
+
+SEED_PASSWORD = "password"
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, duration: float) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(q: float):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2) if ordered else None
+
+        return {
+            "count": len(ordered),
+            "errors": self.errors,
+            "rps": round(len(ordered) / duration, 2),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+class Driver:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats: dict[str, RouteStats] = {}
+        self.admin_headers: dict = {}
+        self.student_ids: list[str] = []
+        self.course_ids: list[str] = []
+        self.teacher_ids: list[str] = []
+        self.classes: list[str] = []
+        self.enrollments: list[tuple[str, str]] = []
+
+    async def request(self, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        stats = self.stats.setdefault(route, RouteStats())
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.errors += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            stats.errors += 1
+        else:
+            stats.latencies.append(elapsed)
+        return response
+
+    def list_params(self) -> dict:
+        return {"limit": self.args.page_size} if self.args.page_size else {}
+
+    async def prepare(self):
+        response = await self.client.post("/auth/login", json={"username": self.args.admin_user, "password": self.args.admin_password})
+        response.raise_for_status()
+        self.admin_headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        sample = {"limit": self.args.sample}
+        self.student_ids = [row["id"] for row in (await self.client.get("/students", params=sample, headers=self.admin_headers)).json()]
+        self.course_ids = [row["id"] for row in (await self.client.get("/courses", params=sample, headers=self.admin_headers)).json()]
+        self.teacher_ids = [row["id"] for row in (await self.client.get("/teachers", params=sample, headers=self.admin_headers)).json()]
+        self.classes = [row["className"] for row in (await self.client.get("/class", headers=self.admin_headers)).json()]
+        for student_id in self.student_ids[:200]:
+            courses = (await self.client.get(f"/students/course-choice/{student_id}", headers=self.admin_headers)).json()
+            self.enrollments.extend((student_id, course["id"]) for course in courses)
+        if not (self.student_ids and self.course_ids and self.enrollments):
+            raise SystemExit("the database has no students, courses or enrollments; run bench/seed.py first")
+
+    async def login(self):
+        username = f"student{self.rng.randrange(self.args.users)}"
+        await self.request("POST /auth/login", "POST", "/auth/login", json={"username": username, "password": SEED_PASSWORD})
+
+    async def list_students(self):
+        await self.request("GET /students", "GET", "/students", params=self.list_params(), headers=self.admin_headers)
+
+    async def student_detail(self):
+        await self.request("GET /students/{id}", "GET", f"/students/{self.rng.choice(self.student_ids)}", headers=self.admin_headers)
+
+    async def course_choice(self):
+        await self.request("GET /students/course-choice/{id}", "GET", f"/students/course-choice/{self.rng.choice(self.student_ids)}", headers=self.admin_headers)
+
+    async def update_score(self):
+        student_id, course_id = self.rng.choice(self.enrollments)
+        score = self.rng.randint(30, 100)
+        await self.request(
+            "PUT /students/course-choice/{id}/{course}/{score}",
+            "PUT",
+            f"/students/course-choice/{student_id}/{course_id}/{score}",
+            headers=self.admin_headers
+        )
+
+    async def list_courses(self):
+        await self.request("GET /courses", "GET", "/courses", params=self.list_params(), headers=self.admin_headers)
+
+    async def course_detail(self):
+        await self.request("GET /courses/{id}", "GET", f"/courses/{self.rng.choice(self.course_ids)}", headers=self.admin_headers)
+
+    async def course_students(self):
+        await self.request("GET /courses/{id}/students", "GET", f"/courses/{self.rng.choice(self.course_ids)}/students", headers=self.admin_headers)
+
+    async def list_teachers(self):
+        await self.request("GET /teachers", "GET", "/teachers", params=self.list_params(), headers=self.admin_headers)
+
+    async def teacher_detail(self):
+        await self.request("GET /teachers/details/{id}", "GET", f"/teachers/details/{self.rng.choice(self.teacher_ids)}", headers=self.admin_headers)
+
+    async def list_classes(self):
+        await self.request("GET /class", "GET", "/class", headers=self.admin_headers)
+
+    async def class_details(self):
+        await self.request("GET /class/{name}/details", "GET", f"/class/{self.rng.choice(self.classes)}/details", headers=self.admin_headers)
+
+    async def statistics(self):
+        await self.request("GET /statistics", "GET", "/statistics")
+
+    def reads(self) -> list[tuple]:
+        return [
+            (self.statistics, 10),
+            (self.student_detail, 20),
+            (self.course_choice, 20),
+            (self.course_detail, 14),
+            (self.course_students, 5),
+            (self.teacher_detail, 5),
+            (self.class_details, 3),
+        ]
+
+    def scenario(self) -> list[tuple]:
+        # Weights follow what the pages in frontend/src/pages call on load and on
+        # typical clicks; the login storm only logs seeded students in.
+        if self.args.scenario == "login-storm":
+            return [(self.login, 1)]
+        return [
+            (self.statistics, 10),
+            (self.list_students, 4),
+            (self.student_detail, 20),
+            (self.course_choice, 20),
+            (self.update_score, 6),
+            (self.list_courses, 4),
+            (self.course_detail, 14),
+            (self.course_students, 5),
+            (self.list_teachers, 2),
+            (self.teacher_detail, 5),
+            (self.list_classes, 3),
+            (self.class_details, 3),
+            (self.login, 4),
+        ]
+
+    async def worker(self, deadline: float, scenario: list[tuple]):
+        operations, weights = zip(*scenario)
+        while time.perf_counter() < deadline:
+            await self.rng.choices(operations, weights)[0]()
+
+    def workers(self) -> list[list[tuple]]:
+        # login-mixed: a share of the workers storms /auth/login while the rest
+        # keep doing authenticated reads, to see what bcrypt does to read latency.
+        if self.args.scenario == "login-mixed":
+            storm = max(1, round(self.args.concurrency * self.args.login_share))
+            return [[(self.login, 1)]] * storm + [self.reads()] * (self.args.concurrency - storm)
+        return [self.scenario()] * self.args.concurrency
+
+    async def run(self) -> float:
+        await self.prepare()
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        await asyncio.gather(*(self.worker(deadline, scenario) for scenario in self.workers()))
+        return time.perf_counter() - started
+
+    async def server_stats(self) -> dict:
+        # Same camelCase keys as /internal/pool and /internal/hashing return.
+        return {
+            "pool": (await self.client.get("/internal/pool", headers=self.admin_headers)).json(),
+            "hashing": (await self.client.get("/internal/hashing", headers=self.admin_headers)).json(),
+        }
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def combine(stats: list[RouteStats]) -> RouteStats:
+    return RouteStats(
+        latencies=[latency for route in stats for latency in route.latencies],
+        errors=sum(route.errors for route in stats)
+    )
+
+def print_report(routes: dict, total: dict, reads: dict, server: dict, baseline: dict | None):
+    print(f"{'route':<52} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, summary in sorted(routes.items()):
+        line = f"{route:<52} {summary['count']:>7} {summary['errors']:>5} {summary['rps']:>8} {summary['p50'] or '-':>8} {summary['p95'] or '-':>8} {summary['p99'] or '-':>8}"
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous and previous.get("p95") and summary["p95"]:
+            line += f"  p95 {summary['p95'] - previous['p95']:+.2f} ms vs {baseline.get('commit') or 'baseline'}"
+        print(line)
+    print(f"total {total['count']} requests, {total['errors']} errors, {total['rps']} req/s")
+    if reads["count"]:
+        print(f"reads {reads['count']} requests, {reads['errors']} errors, p50 {reads['p50']} ms, p99 {reads['p99']} ms")
+    hashing = server["hashing"]
+    print(
+        f"hashing: {hashing['completed']} hashed, {hashing['rejected']} rejected, average wait {hashing['averageWaitMs']} ms; "
+        f"pool: {server['pool']['acquireTimeouts']} acquire timeouts"
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay the frontend's request mix against a running backend")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["mixed", "login-storm", "login-mixed"], default="mixed")
+    parser.add_argument("--login-share", type=float, default=0.5, help="share of workers logging in for login-mixed")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--page-size", type=int, help="pass ?limit= on list calls (the frontend loads full lists)")
+    parser.add_argument("--sample", type=int, default=1000, help="ids fetched up front to pick random targets from")
+    parser.add_argument("--users", type=int, default=1000, help="seeded student accounts available for logins")
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to print p95 deltas against")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        driver = Driver(client, args)
+        duration = await driver.run()
+        server = await driver.server_stats()
+
+    routes = {route: stats.summary(duration) for route, stats in driver.stats.items()}
+    total = combine(list(driver.stats.values())).summary(duration)
+    reads = combine([stats for route, stats in driver.stats.items() if route.startswith("GET ")]).summary(duration)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(routes, total, reads, server, baseline)
+
+    if args.output:
+        result = {
+            "commit": git_commit(),
+            "started_at": started_at,
+            "scenario": args.scenario,
+            "duration": round(duration, 2),
+            "concurrency": args.concurrency,
+            "page_size": args.page_size,
+            "total": total,
+            "reads": reads,
+            "routes": routes,
+            "server": server,
+        }
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
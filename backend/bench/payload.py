@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import time
+import httpx
+
+ENCODINGS = ["identity", "gzip", "br"]
+SUMS = {
+    "serialization": "http_request_serialization_seconds_sum",
+    "compression": "http_request_compression_seconds_sum",
+}
+
+def metric_sums(text: str, route: str) -> dict[str, float]:
+    labels = f'{{method="GET",route="{route}"}}'
+    sums = {key: 0.0 for key in SUMS}
+    for line in text.splitlines():
+        for key, name in SUMS.items():
+            if line.startswith(name + labels):
+                sums[key] = float(line.rsplit(" ", 1)[1])
+    return sums
+
+class Measurer:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.headers: dict = {}
+
+    async def prepare(self) -> list[tuple[str, str, str]]:
+        response = await self.client.post("/auth/login", json={"username": self.args.admin_user, "password": self.args.admin_password})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        student_id = (await self.client.get("/students", params={"limit": 1}, headers=self.headers)).json()[0]["id"]
+        courses = (await self.client.get("/courses", params={"limit": 200}, headers=self.headers)).json()
+        # The course with the most students makes the largest roster.
+        sizes = []
+        for course in courses:
+            info = (await self.client.get(f"/courses/{course['id']}", params={"fields": "studentCount"}, headers=self.headers)).json()
+            sizes.append((info["studentCount"], course["id"]))
+        course_id = max(sizes)[1]
+        # (label, route template as reported by /metrics, url)
+        return [
+            ("students list", "/students", f"/students?limit={self.args.page_size}"),
+            ("teachers list", "/teachers", "/teachers"),
+            ("course roster", "/courses/{course_id}/students", f"/courses/{course_id}/students"),
+            ("student details", "/students/{student_id}", f"/students/{student_id}"),
+            ("course details", "/courses/{course_id}", f"/courses/{course_id}"),
+        ]
+
+    async def fetch(self, url: str, encoding: str) -> tuple[int, float]:
+        started = time.perf_counter()
+        size = 0
+        async with self.client.stream("GET", url, headers={**self.headers, "Accept-Encoding": encoding}) as response:
+            response.raise_for_status()
+            # Raw bytes as they came over the wire, before any decoding.
+            async for chunk in response.aiter_raw():
+                size += len(chunk)
+        return size, time.perf_counter() - started
+
+    async def measure(self, label: str, route: str, url: str, fields: str | None, encoding: str) -> dict:
+        if fields:
+            url += ("&" if "?" in url else "?") + f"fields={fields}"
+        before = metric_sums((await self.client.get("/metrics")).text, route)
+        sizes = []
+        latencies = []
+        for _ in range(self.args.runs):
+            size, seconds = await self.fetch(url, encoding)
+            sizes.append(size)
+            latencies.append(seconds)
+        after = metric_sums((await self.client.get("/metrics")).text, route)
+        latencies.sort()
+        return {
+            "target": label,
+            "fields": fields or "all",
+            "encoding": encoding,
+            "bytes": sizes[-1],
+            "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+            "serialization_ms": round((after["serialization"] - before["serialization"]) / self.args.runs * 1000, 3),
+            "compression_ms": round((after["compression"] - before["compression"]) / self.args.runs * 1000, 3),
+        }
+
+    async def run(self) -> list[dict]:
+        results = []
+        for label, route, url in await self.prepare():
+            for fields in (None, self.args.fields):
+                for encoding in self.args.encodings:
+                    results.append(await self.measure(label, route, url, fields, encoding))
+        return results
+
+def print_report(results: list[dict]):
+    print(f"{'target':<16} {'fields':<10} {'encoding':<9} {'bytes':>10} {'p50 ms':>8} {'serialize ms':>13} {'compress ms':>12}")
+    for row in results:
+        print(
+            f"{row['target']:<16} {row['fields']:<10} {row['encoding']:<9} {row['bytes']:>10} {row['p50']:>8} "
+            f"{row['serialization_ms']:>13} {row['compression_ms']:>12}"
+        )
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure bytes on the wire and server CPU per response shape and encoding")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=1000, help="?limit= for the students list")
+    parser.add_argument("--fields", default="id,name", help="sparse fieldset compared against the full response")
+    parser.add_argument("--encodings", nargs="+", choices=ENCODINGS, default=ENCODINGS)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        results = await Measurer(client, args).run()
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
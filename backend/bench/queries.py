@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asyncpg import connect
+from config import settings
+from db import classes, courses, database, students, teachers, user  # register their queries
+from db.queries import REGISTRY
+
+def parse_value(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def percentile(samples: list[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+async def measure(conn, query, args: list, runs: int) -> list[float]:
+    samples = []
+    # Reads run inside a transaction that is rolled back, so write queries can be measured too.
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            await query.fetch(conn, *args)
+            samples.append(time.perf_counter() - started)
+    finally:
+        await transaction.rollback()
+    return sorted(samples)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Time one registered query with and without a cached prepared statement")
+    parser.add_argument("query", choices=sorted(REGISTRY))
+    parser.add_argument("args", nargs="*", help="query arguments as JSON literals (strings may be bare)")
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+
+    query = REGISTRY[args.query]
+    values = [parse_value(value) for value in args.args]
+    config = settings.database
+    options = dict(user=config.user, password=config.password, database=config.dbname, host=config.host, port=config.port)
+    for label, cache_size in (("prepared", config.statement_cache_size), ("unprepared", 0)):
+        conn = await connect(statement_cache_size=cache_size, **options)
+        try:
+            samples = await measure(conn, query, values, args.runs)
+        finally:
+            await conn.close()
+        print(
+            f"{query.name:<32} {label:<10} "
+            f"p50 {percentile(samples, 0.5):7.3f} ms  p95 {percentile(samples, 0.95):7.3f} ms  p99 {percentile(samples, 0.99):7.3f} ms"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asyncpg import Connection, connect
+from auth import hash_password
+from config import settings
+
+BATCH_SIZE = 50000
+FIRST_NAMES = ["Oliver", "Sophie", "Takashi", "Isabella", "Liam", "Amina", "David", "Yuki", "Rafael", "Zoe", "Lucas", "Emma", "Chen", "Laura", "Markus", "Elena"]
+LAST_NAMES = ["García", "Dupont", "Yamamoto", "Rossi", "O'Connor", "Ahmed", "Müller", "Tanaka", "Oliveira", "Patel", "Silva", "Johansson", "Wei", "Petrova", "Schmidt", "Smith"]
+SUBJECTS = ["Mathematics", "Physics", "Literature", "Biology", "Computer Science", "History", "Chemistry", "Philosophy", "Economics", "Statistics", "Psychology", "Sociology"]
+SEED_PASSWORD = "password"
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def batches(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def reserve_ids(conn: Connection, sequence: str, count: int) -> int:
+    first = await conn.fetchval("SELECT nextval($1::regclass);", sequence)
+    if count > 1:
+        await conn.execute("SELECT setval($1::regclass, $2);", sequence, first + count - 1)
+    return first
+
+async def copy(conn: Connection, table: str, columns: list[str], rows) -> int:
+    total = 0
+    for batch in batches(rows):
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    return total
+
+def generate_students(rng: random.Random, ids: list[str], class_size: int):
+    for index, student_id in enumerate(ids):
+        entrance_year = rng.randint(2015, 2024)
+        yield (
+            student_id,
+            person_name(rng),
+            rng.choice(["male", "female"]),
+            rng.randint(17, 25),
+            entrance_year,
+            f"{chr(ord('A') + index % 26)}{index // (26 * class_size) + 1}"
+        )
+
+def generate_courses(rng: random.Random, ids: list[str]):
+    for index, course_id in enumerate(ids):
+        yield (
+            course_id,
+            f"{SUBJECTS[index % len(SUBJECTS)]} {index // len(SUBJECTS) + 1}",
+            rng.randint(1, 6),
+            Decimal(rng.randint(4000, 9000)) / 100,
+            rng.choice([None] * 9 + [rng.randint(2018, 2024)])
+        )
+
+def generate_course_teachers(rng: random.Random, course_ids: list[str], teacher_ids: list[str]):
+    for course_id in course_ids:
+        for teacher_id in rng.sample(teacher_ids, min(len(teacher_ids), rng.choice([1, 1, 2]))):
+            yield course_id, teacher_id
+
+def generate_enrollments(rng: random.Random, student_ids: list[str], course_ids: list[str], total: int, scored: float):
+    per_student, extra = divmod(total, len(student_ids))
+    for index, student_id in enumerate(student_ids):
+        count = min(len(course_ids), per_student + (1 if index < extra else 0))
+        for course_id in rng.sample(course_ids, count):
+            score = Decimal(rng.randint(3000, 10000)) / 100 if rng.random() < scored else None
+            yield student_id, course_id, rng.randint(2015, 2024), score
+
+async def truncate(conn: Connection):
+    # users references students and teachers, so Postgres only truncates them
+    # together with users. Admin accounts are kept aside and put back.
+    await conn.execute("CREATE TEMP TABLE seed_admins ON COMMIT DROP AS SELECT * FROM users WHERE role = 'admin';")
+    await conn.execute("TRUNCATE course_choosing, course_teacher, users, students, courses, teachers;")
+    await conn.execute("INSERT INTO users SELECT * FROM seed_admins;")
+
+async def seed(args) -> dict:
+    rng = random.Random(args.seed)
+    config = settings.database
+    conn = await connect(user=config.user, password=config.password, database=config.dbname, host=config.host, port=config.port)
+    counts = {}
+    try:
+        async with conn.transaction():
+            if args.truncate:
+                await truncate(conn)
+
+            first = await reserve_ids(conn, "teacher_id_seq", args.teachers)
+            teacher_ids = [f"T{number:04d}" for number in range(first, first + args.teachers)]
+            first = await reserve_ids(conn, "course_id_seq", args.courses)
+            course_ids = [f"C{number:06d}" for number in range(first, first + args.courses)]
+            first = await reserve_ids(conn, "student_id_seq", args.students)
+            student_ids = [f"S{number:09d}" for number in range(first, first + args.students)]
+
+            counts["teachers"] = await copy(conn, "teachers", ["teacher_id", "name"], ((teacher_id, person_name(rng)) for teacher_id in teacher_ids))
+            counts["courses"] = await copy(conn, "courses", ["course_id", "name", "credit", "grade", "canceled_year"], generate_courses(rng, course_ids))
+            counts["students"] = await copy(
+                conn,
+                "students",
+                ["student_id", "name", "sex", "entrance_age", "entrance_year", "class"],
+                generate_students(rng, student_ids, args.class_size)
+            )
+            counts["course_teacher"] = await copy(conn, "course_teacher", ["course_id", "teacher_id"], generate_course_teachers(rng, course_ids, teacher_ids))
+            counts["course_choosing"] = await copy(
+                conn,
+                "course_choosing",
+                ["student_id", "course_id", "chosen_year", "score"],
+                generate_enrollments(rng, student_ids, course_ids, args.enrollments, args.scored)
+            )
+
+            with open("config.json", "r") as config_file:
+                rounds = json.load(config_file).get("hashing", {}).get("bcrypt_rounds", 12)
+            password_hash = hash_password(SEED_PASSWORD, rounds)
+            counts["users"] = await copy(
+                conn,
+                "users",
+                ["username", "password_hash", "role", "student_id"],
+                ((f"student{index}", password_hash, "student", student_id) for index, student_id in enumerate(student_ids[:args.users]))
+            )
+
+            await conn.execute("CALL rebuild_statistics();")
+        await conn.execute("ANALYZE;")
+    finally:
+        await conn.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the database with a synthetic college-sized dataset through COPY")
+    parser.add_argument("--students", type=int, default=200000)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--teachers", type=int, default=500)
+    parser.add_argument("--enrollments", type=int, default=3000000)
+    parser.add_argument("--users", type=int, default=1000, help=f"student accounts student0..N-1, all with password '{SEED_PASSWORD}'")
+    parser.add_argument("--class-size", type=int, default=30)
+    parser.add_argument("--scored", type=float, default=0.8, help="share of enrollments that already have a score")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--truncate", action="store_true", help="delete existing students, courses, teachers and non-admin users first")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = asyncio.run(seed(args))
+    for table, count in counts.items():
+        print(f"{table:<16} {count:>10}")
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
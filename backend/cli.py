@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import os
+import sys
+from db.database import check_statistics, db, rebuild_statistics
+from db.migrate import migrate
+from db.plans import check_plans
+from db.imports import COURSE_CHOOSING_IMPORT_COLUMNS, COURSE_IMPORT_COLUMNS, STUDENT_IMPORT_COLUMNS, import_course_choosing, import_courses, import_students
+from utils.imports import parse_records, prepare_import_report
+
+IMPORTERS = {
+    "students": (STUDENT_IMPORT_COLUMNS, import_students),
+    "courses": (COURSE_IMPORT_COLUMNS, import_courses),
+    "course-choosing": (COURSE_CHOOSING_IMPORT_COLUMNS, import_course_choosing),
+}
+
+async def run_import(args):
+    columns, importer = IMPORTERS[args.table]
+    fmt = args.format or ("ndjson" if os.path.splitext(args.path)[1] in (".ndjson", ".jsonl") else "csv")
+    with open(args.path, "r", encoding="utf-8-sig") as source:
+        records = parse_records(source.read(), fmt, columns)
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            report = prepare_import_report(await importer(conn, records))
+    finally:
+        await db.disconnect()
+    for error in report.errors:
+        print(f"row {error.row}: {error.error}", file=sys.stderr)
+    print(f"imported {report.imported} of {report.total} rows")
+    return 0 if not report.errors else 1
+
+async def run_check_statistics(args):
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            drift = await check_statistics(conn)
+            if drift and args.repair:
+                await rebuild_statistics(conn)
+    finally:
+        await db.disconnect()
+    for row in drift:
+        print(f"{row['metric']}: maintained {row['maintained']}, actual {row['actual']}")
+    if not drift:
+        print("statistics are consistent")
+    elif args.repair:
+        print("statistics rebuilt")
+    return 0 if not drift else 1
+
+async def run_migrate(args):
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            applied = await migrate(conn)
+    finally:
+        await db.disconnect()
+    for name in applied:
+        print(f"applied {name}")
+    if not applied:
+        print("schema is up to date")
+    return 0
+
+async def run_check_plans(args):
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            results = await check_plans(conn)
+    finally:
+        await db.disconnect()
+    failed = False
+    for name, problems in results:
+        if problems is None:
+            print(f"{name}: skipped, no data to pick arguments from")
+            continue
+        print(f"{name}: {', '.join(problems) if problems else 'ok'}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="MIS backend maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="bulk load students, courses or enrollments")
+    import_parser.add_argument("table", choices=IMPORTERS.keys())
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"])
+    import_parser.set_defaults(handler=run_import)
+
+    check_parser = commands.add_parser("check-statistics", help="recompute statistics from scratch and report drift")
+    check_parser.add_argument("--repair", action="store_true", help="rebuild the maintained statistics if they drifted")
+    check_parser.set_defaults(handler=run_check_statistics)
+
+    migrate_parser = commands.add_parser("migrate", help="apply pending schema migrations")
+    migrate_parser.set_defaults(handler=run_migrate)
+
+    plans_parser = commands.add_parser("check-plans", help="fail if a hot query seq-scans a large table or calls a non-inlined function")
+    plans_parser.set_defaults(handler=run_check_plans)
+
+    args = parser.parse_args()
+    return asyncio.run(args.handler(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,22 +2,83 @@ import os
 from pydantic import BaseModel
 
 class DBConfig(BaseModel):
-    host: str = os.getenv("DB_HOST", "localhost")
+    host: str = os.getenv("DB_HOST", "db")
     port: int = int(os.getenv("DB_PORT", 5432))
     user: str = os.getenv("DB_USER", "user")
     password: str = os.getenv("DB_PASSWORD", "password")
     dbname: str = os.getenv("DB_NAME", "dbname")
+    min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", 10))
+    max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+    max_queries: int = int(os.getenv("DB_POOL_MAX_QUERIES", 50000))
+    max_inactive_lifetime: float = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", 300.0))
+    acquire_timeout: float = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", 10.0))
+    statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    warm_up: bool = os.getenv("DB_POOL_WARM_UP", "true").lower() == "true"
+    replicas: str = os.getenv("DB_REPLICAS", "")
+    replica_check_interval: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 5.0))
+    replica_check_timeout: float = float(os.getenv("DB_REPLICA_CHECK_TIMEOUT", 2.0))
+    replica_max_lag: float = float(os.getenv("DB_REPLICA_MAX_LAG", 5.0))
+    replica_receiver_timeout: float = float(os.getenv("DB_REPLICA_RECEIVER_TIMEOUT", 60.0))
+    read_your_writes: float = float(os.getenv("DB_READ_YOUR_WRITES", 5.0))
 
     def get_dsn(self) -> str:
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.dbname}"
 
+    def get_replicas(self) -> list[tuple[str, int]]:
+        replicas = []
+        for entry in self.replicas.split(","):
+            entry = entry.strip()
+            if entry:
+                host, _, port = entry.partition(":")
+                replicas.append((host, int(port) if port else self.port))
+        return replicas
+
 class JWTConfig(BaseModel):
     secret_key: str = os.getenv("JWT_SECRET", "your-secret-key")
     algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
     expiration_days: int = int(os.getenv("JWT_EXPIRE_DAYS", 7))
 
+class APIConfig(BaseModel):
+    fast_json: bool = os.getenv("API_FAST_JSON", "false").lower() == "true"
+
+class SlowQueryConfig(BaseModel):
+    threshold_ms: float = float(os.getenv("SLOW_QUERY_MS", 250))
+    sample_rate: float = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", 0.1))
+    buffer_size: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", 200))
+    explain_timeout_ms: int = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 5000))
+
+class CacheConfig(BaseModel):
+    catalog_size: int = int(os.getenv("CATALOG_CACHE_SIZE", 1024))
+    catalog_ttl: float = float(os.getenv("CATALOG_CACHE_TTL", 60))
+
+class EventsConfig(BaseModel):
+    max_clients: int = int(os.getenv("EVENTS_MAX_CLIENTS", 1000))
+    queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", 256))
+    keepalive: float = float(os.getenv("EVENTS_KEEPALIVE", 15))
+
+class AdmissionConfig(BaseModel):
+    enabled: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    capacity: int = int(os.getenv("ADMISSION_CAPACITY", 0))
+    queue_size: int = int(os.getenv("ADMISSION_QUEUE_SIZE", 100))
+    queue_timeout: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 5.0))
+    heavy_limit: int = int(os.getenv("ADMISSION_HEAVY_LIMIT", 2))
+    heavy_queue_size: int = int(os.getenv("ADMISSION_HEAVY_QUEUE_SIZE", 10))
+    retry_after: int = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+class CompressionConfig(BaseModel):
+    enabled: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    minimum_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
 class Settings(BaseModel):
     database: DBConfig = DBConfig()
     jwt: JWTConfig = JWTConfig()
+    api: APIConfig = APIConfig()
+    slow_queries: SlowQueryConfig = SlowQueryConfig()
+    cache: CacheConfig = CacheConfig()
+    events: EventsConfig = EventsConfig()
+    admission: AdmissionConfig = AdmissionConfig()
+    compression: CompressionConfig = CompressionConfig()
 
 settings = Settings()
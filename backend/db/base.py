@@ -1,14 +1,58 @@
+import time
 from asyncpg import Connection
+from utils.metrics import record_db
+from .slow_queries import slow_query_log
 
-async def fetch_one(conn: Connection, query: str, *args):
-    result = await conn.fetch(query, *args)
-    return result[0] if result else None
+def observe(query: str, args: tuple, started: float):
+    record_query(query, args, time.perf_counter() - started)
+
+def record_query(query: str, args: tuple, seconds: float):
+    record_db(seconds)
+    if seconds >= slow_query_log.threshold:
+        slow_query_log.record(query, args, seconds)
+
+async def fetch_all(conn: Connection, query: str, *args):
+    started = time.perf_counter()
+    try:
+        return await conn.fetch(query, *args)
+    finally:
+        observe(query, args, started)
 
 async def fetch_row(conn: Connection, query: str, *args):
-    return await conn.fetchrow(query, *args)
+    started = time.perf_counter()
+    try:
+        return await conn.fetchrow(query, *args)
+    finally:
+        observe(query, args, started)
 
-async def call_proc(conn: Connection, proc: str, *args):
-    await conn.fetch(f"CALL {proc};", *args)
+async def fetch_val(conn: Connection, query: str, *args):
+    started = time.perf_counter()
+    try:
+        return await conn.fetchval(query, *args)
+    finally:
+        observe(query, args, started)
 
-async def fetch_all(conn: Connection, query: str, *args):
-    return await conn.fetch(query, *args)
\ No newline at end of file
+async def execute(conn: Connection, query: str, *args):
+    started = time.perf_counter()
+    try:
+        return await conn.execute(query, *args)
+    finally:
+        observe(query, args, started)
+
+async def iterate(conn: Connection, query: str, *args, prefetch: int = 1000):
+    # Only the time spent waiting on the cursor counts, not the time the caller
+    # takes with each row, so a slow client does not show up as a slow query.
+    cursor = conn.cursor(query, *args, prefetch=prefetch).__aiter__()
+    seconds = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                record = await cursor.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - started
+            yield record
+    finally:
+        record_query(query, args, seconds)
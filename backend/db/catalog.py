@@ -0,0 +1,80 @@
+from asyncpg import Connection
+from config import CacheConfig, settings
+from utils.cache import TTLCache
+from .database import db
+from .listener import listener
+from .teachers import get_teacher, get_teacher_courses, get_teachers
+from .courses import get_courses
+from .versions import COURSE_TABLES, TEACHER_COURSE_TABLES, TEACHER_DETAIL_TABLES, TEACHER_TABLES, get_table_versions
+
+TABLE_CHANGED_CHANNEL = "table_changed"
+MISSING = object()
+
+# Read-through cache for the course catalog and teacher roster. Entries are tagged
+# with the tables they were read from and dropped when one of them is written, by
+# the write routes of this worker and through table_changed notifications from
+# any worker. Without a listening connection nothing is stored.
+class CatalogCache:
+    def __init__(self, config: CacheConfig = settings.cache):
+        self.entries = TTLCache(config.catalog_size, config.catalog_ttl)
+        self.generations: dict[str, int] = {}
+        self.epoch = 0
+        self.invalidations = 0
+
+    def snapshot(self, tables: tuple[str, ...]) -> tuple:
+        return self.epoch, *(self.generations.get(table, 0) for table in tables)
+
+    async def get(self, key: tuple, tables: tuple[str, ...], load):
+        entry = self.entries.get(key, MISSING)
+        if entry is not MISSING:
+            return entry[1]
+        # A write committed while loading bumps a generation, and the possibly
+        # stale result is returned without being stored.
+        # Loads read the primary: a replica may not have replayed the write whose
+        # notification just emptied the entry.
+        before = self.snapshot(tables)
+        async with db.acquire(primary=True) as conn:
+            value = await load(conn)
+        if listener.connected and self.snapshot(tables) == before:
+            self.entries.set(key, (tables, value))
+        return value
+
+    def invalidate(self, *tables: str):
+        for table in tables:
+            self.generations[table] = self.generations.get(table, 0) + 1
+        self.invalidations += self.entries.discard_where(lambda entry: any(table in entry[0] for table in tables))
+
+    def notified(self, payload: str):
+        self.invalidate(payload)
+
+    def clear(self):
+        self.epoch += 1
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.entries.stats(), "invalidations": self.invalidations, "listening": listener.connected}
+
+catalog_cache = CatalogCache()
+listener.subscribe(TABLE_CHANGED_CHANNEL, catalog_cache.notified)
+listener.on_reset(catalog_cache.clear)
+
+async def cached_table_versions(tables: tuple[str, ...]) -> dict[str, int]:
+    return await catalog_cache.get(("versions", tables), tables, lambda conn: get_table_versions(conn, tables))
+
+async def cached_courses(after: str = None, limit: int = None, canceled_year: int = None):
+    return await catalog_cache.get(("courses", after, limit, canceled_year), COURSE_TABLES, lambda conn: get_courses(conn, after, limit, canceled_year))
+
+async def cached_teachers(after: str = None, limit: int = None):
+    return await catalog_cache.get(("teachers", after, limit), TEACHER_TABLES, lambda conn: get_teachers(conn, after, limit))
+
+async def load_teacher_details(conn: Connection, teacher_id: str):
+    # One snapshot for both reads, so the teacher and their courses cannot come
+    # from either side of a concurrent write.
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        return await get_teacher(conn, teacher_id), await get_teacher_courses(conn, teacher_id)
+
+async def cached_teacher_details(teacher_id: str):
+    return await catalog_cache.get(("teacher_details", teacher_id), TEACHER_DETAIL_TABLES, lambda conn: load_teacher_details(conn, teacher_id))
+
+async def cached_teacher_courses(teacher_id: str):
+    return await catalog_cache.get(("teacher_courses", teacher_id), TEACHER_COURSE_TABLES, lambda conn: get_teacher_courses(conn, teacher_id))
@@ -1,6 +1,15 @@
 from asyncpg import Connection
-from .base import fetch_row
+from .queries import select
+
+GET_CLASS_AVERAGE_SCORE = select("get_students_average_score_by_class", "SELECT * FROM get_students_average_score_by_class($1)")
+GET_CLASS_SUMMARIES = select("get_class_summaries", "SELECT * FROM get_class_summaries()")
+GET_CLASS_SUMMARY = select("get_class_summary", "SELECT * FROM get_class_summary($1)", single_row=True)
 
 async def get_students_average_score_by_class(conn: Connection, student_class: str):
-    row = await fetch_row(conn, "SELECT get_students_average_score_by_class($1);", student_class)
-    return row[0] if row else None
\ No newline at end of file
+    return await GET_CLASS_AVERAGE_SCORE.fetchval(conn, student_class)
+
+async def get_class_summaries(conn: Connection):
+    return await GET_CLASS_SUMMARIES.fetch(conn)
+
+async def get_class_summary(conn: Connection, student_class: str):
+    return await GET_CLASS_SUMMARY.fetchrow(conn, student_class)
@@ -1,25 +1,49 @@
 from asyncpg import Connection
-from models.schemas import Course
-from .base import fetch_one, call_proc, fetch_all
+from models.schemas import Course, ScoreUpdate
+from .queries import call, page, projected, select
 
-async def get_course_students(conn: Connection, course_id: str):
-    return await fetch_all(conn, "SELECT * FROM get_course_scores($1);", course_id)
+GET_COURSE_SCORES = select("get_course_scores", "SELECT * FROM get_course_scores($1)")
+COURSES_PAGE = page("courses_page", "courses", "course_id", ("canceled_year",))
+GET_COURSE = select("get_course", "SELECT * FROM get_course($1)", single_row=True)
+GET_COURSE_INFO = select("get_course_info", "SELECT * FROM get_course_info($1)", single_row=True)
+INSERT_COURSE = call("insert_course", "insert_course($1, $2, $3, $4)")
+DELETE_COURSE = call("delete_course", "delete_course($1)")
+UPDATE_COURSE = call("update_course", "update_course($1, $2, $3, $4, $5)")
+SET_COURSE_SCORES = select("set_course_scores", "SELECT * FROM set_course_scores($1, $2, $3, $4, $5)")
 
-async def get_courses(conn: Connection):
-    return await fetch_all(conn, "SELECT * FROM get_courses();")
+async def get_course_students(conn: Connection, course_id: str, columns: tuple[str, ...] = None):
+    query = projected(GET_COURSE_SCORES, columns) if columns else GET_COURSE_SCORES
+    return await query.fetch(conn, course_id)
+
+async def get_courses(conn: Connection, after: str = None, limit: int = None, canceled_year: int = None):
+    return await COURSES_PAGE.fetch(conn, after, limit, {"canceled_year": canceled_year})
 
 async def get_course(conn: Connection, course_id: str):
-    return await fetch_one(conn, "SELECT * FROM get_course($1);", course_id)
+    return await GET_COURSE.fetchrow(conn, course_id)
+
+async def get_course_info(conn: Connection, course_id: str, columns: tuple[str, ...] = None):
+    query = projected(GET_COURSE_INFO, columns) if columns else GET_COURSE_INFO
+    return await query.fetchrow(conn, course_id)
 
 
 async def add_course(conn: Connection, course: Course):
-    await call_proc(conn, "insert_course($1, $2, $3, $4)", course.name, course.credit, course.grade, course.canceledYear)
+    await INSERT_COURSE.execute(conn, course.name, course.credit, course.grade, course.canceledYear)
 
 
 async def delete_course(conn: Connection, course_id: str):
-    await call_proc(conn, "delete_course($1)", course_id)
+    await DELETE_COURSE.execute(conn, course_id)
 
 
 async def update_course(conn: Connection, course_id: str, course: Course):
-    await call_proc(conn, "update_course($1, $2, $3, $4, $5)", course_id, course.name, course.credit, course.grade, course.canceledYear)
-
+    await UPDATE_COURSE.execute(conn, course_id, course.name, course.credit, course.grade, course.canceledYear)
+
+
+async def set_course_scores(conn: Connection, course_id: str, scores: list[ScoreUpdate]):
+    return await SET_COURSE_SCORES.fetch(
+        conn,
+        course_id,
+        [entry.studentId for entry in scores],
+        [entry.score for entry in scores],
+        [entry.previousScore for entry in scores],
+        ["previousScore" in entry.model_fields_set for entry in scores]
+    )
@@ -1,26 +1,231 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from asyncpg import Connection, create_pool
-import os
-from .base import fetch_one
+from config import DBConfig, settings
+from utils.metrics import LatencyWindow, record_acquire
+from .queries import call, select
+from .routing import current_routing
+from .slow_queries import slow_query_log
+from .classes import get_class_summary
+from .courses import get_course, get_course_info, get_courses
+from .students import get_student, get_student_info, get_students
+from .teachers import get_teachers
+from .user import get_user
+
+# Seconds a replica is behind the primary; 0 on the primary itself and on a
+# replica that has replayed everything it received (the replay timestamp of an
+# idle replica keeps ageing even though nothing is missing).
+# Receive LSN = replay LSN also holds once the WAL receiver has disconnected,
+# so a standby only counts as caught up while it streams and has heard from
+# the primary within $1 seconds. NULL means the lag is unknown.
+REPLICA_LAG = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (
+        SELECT 1 FROM pg_stat_wal_receiver
+        WHERE status = 'streaming' AND last_msg_receipt_time > now() - make_interval(secs => $1)
+    ) THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END::FLOAT8;
+"""
+
+class PoolTimeoutError(Exception):
+    pass
+
+class Replica:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.pool = None
+        self.healthy = False
+        self.lag: float | None = None
+        self.error: str | None = None
+        self.acquired = 0
+
+    def stats(self) -> dict:
+        size = self.pool.get_size() if self.pool else 0
+        idle = self.pool.get_idle_size() if self.pool else 0
+        return {
+            "host": self.host,
+            "port": self.port,
+            "healthy": self.healthy,
+            "lagSeconds": self.lag,
+            "error": self.error,
+            "size": size,
+            "inUse": size - idle,
+            "acquired": self.acquired,
+        }
 
 class Database:
-    def __init__(self):
+    def __init__(self, config: DBConfig = settings.database):
+        self.config = config
         self.pool = None
+        self.replicas = [Replica(host, port) for host, port in config.get_replicas()]
+        self.next_replica = 0
+        self.replica_fallbacks = 0
+        self.health_task: asyncio.Task | None = None
+        self.acquire_wait = LatencyWindow()
+        self.acquire_timeouts = 0
+
+    def pool_options(self) -> dict:
+        return {
+            "user": self.config.user,
+            "password": self.config.password,
+            "database": self.config.dbname,
+            "min_size": self.config.min_size,
+            "max_size": self.config.max_size,
+            "max_queries": self.config.max_queries,
+            "max_inactive_connection_lifetime": self.config.max_inactive_lifetime,
+            "statement_cache_size": self.config.statement_cache_size,
+        }
 
     async def connect(self):
-        self.pool = await create_pool(
-            user=os.getenv("DB_USER", "user"),
-            password=os.getenv("DB_PASSWORD", "password"),
-            database=os.getenv("DB_NAME", "dbname"),
-            host=os.getenv("DB_HOST", "db"),
-            port=int(os.getenv("DB_PORT", 5432))
-        )
+        self.pool = await create_pool(host=self.config.host, port=self.config.port, **self.pool_options())
+        slow_query_log.pool = self.pool
+        if self.replicas:
+            await self.check_replicas()
+            self.health_task = asyncio.get_running_loop().create_task(self.watch_replicas())
+
+    async def check_replica(self, replica: Replica):
+        # An unreachable replica does not stop startup: it stays unhealthy and its
+        # pool is created by a later check.
+        try:
+            if replica.pool is None:
+                replica.pool = await create_pool(
+                    host=replica.host,
+                    port=replica.port,
+                    timeout=self.config.replica_check_timeout,
+                    **self.pool_options()
+                )
+            async with replica.pool.acquire(timeout=self.config.replica_check_timeout) as conn:
+                replica.lag = await conn.fetchval(
+                    REPLICA_LAG, self.config.replica_receiver_timeout, timeout=self.config.replica_check_timeout
+                )
+            if replica.lag is None:
+                replica.healthy = False
+                replica.error = "WAL receiver is not streaming from the primary"
+                return
+            replica.healthy = not self.config.replica_max_lag or replica.lag <= self.config.replica_max_lag
+            replica.error = None if replica.healthy else f"Replica is {replica.lag:.1f}s behind"
+        except Exception as e:
+            replica.healthy = False
+            replica.error = str(e) or type(e).__name__
+
+    async def check_replicas(self):
+        await asyncio.gather(*(self.check_replica(replica) for replica in self.replicas))
+
+    async def watch_replicas(self):
+        while True:
+            await asyncio.sleep(self.config.replica_check_interval)
+            await self.check_replicas()
+
+    def pick_replica(self) -> Replica | None:
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self.next_replica % len(self.replicas)]
+            self.next_replica += 1
+            if replica.healthy:
+                return replica
+        return None
+
+    async def warm_up(self):
+        for pool in [self.pool, *(replica.pool for replica in self.replicas if replica.healthy)]:
+            await warm_up_pool(pool, self.config.min_size)
+
+    @asynccontextmanager
+    async def acquire(self, primary: bool = False):
+        # Reads of GET requests go to a healthy replica, round robin; everything
+        # else, and primary=True (reads that must see the latest commit), uses the
+        # primary. With no healthy replica the primary serves the read.
+        pool = self.pool
+        routing = current_routing.get()
+        if self.replicas and not primary and routing is not None and routing.replica:
+            replica = self.pick_replica()
+            if replica is None:
+                self.replica_fallbacks += 1
+            else:
+                replica.acquired += 1
+                pool = replica.pool
+        timeout = self.config.acquire_timeout or None
+        started = time.perf_counter()
+        try:
+            conn = await pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            raise PoolTimeoutError(f"Timed out after {timeout}s waiting for a database connection")
+        finally:
+            waited = time.perf_counter() - started
+            self.acquire_wait.record(waited)
+            record_acquire(waited)
+        try:
+            yield conn
+        finally:
+            await pool.release(conn)
+
+    def stats(self) -> dict:
+        size = self.pool.get_size() if self.pool else 0
+        idle = self.pool.get_idle_size() if self.pool else 0
+        return {
+            "minSize": self.config.min_size,
+            "maxSize": self.config.max_size,
+            "size": size,
+            "inUse": size - idle,
+            "idle": idle,
+            "acquired": self.acquire_wait.count,
+            "acquireTimeouts": self.acquire_timeouts,
+            "acquireWaitMs": self.acquire_wait.percentiles(0.5, 0.95, 0.99),
+            "replicas": [replica.stats() for replica in self.replicas],
+            "replicaFallbacks": self.replica_fallbacks,
+        }
     
     async def disconnect(self):
+        if self.health_task:
+            self.health_task.cancel()
+            self.health_task = None
+        for replica in self.replicas:
+            if replica.pool:
+                await replica.pool.close()
+                replica.pool = None
+            replica.healthy = False
         if self.pool:
+            slow_query_log.pool = None
             await self.pool.close()
             self.pool = None
 
+GET_STATISTICS = select("get_statistics", "SELECT * FROM get_statistics()")
+CHECK_STATISTICS = select("check_statistics", "SELECT * FROM check_statistics()")
+REBUILD_STATISTICS = call("rebuild_statistics", "rebuild_statistics()")
+
 db = Database()
 
+async def warm_up_pool(pool, size: int):
+    # Hold size connections at once so every one of them runs the hot statements
+    # and has them in its statement cache before the first request.
+    connections = await asyncio.gather(*(pool.acquire() for _ in range(size)))
+    try:
+        await asyncio.gather(*(prepare_hot_statements(conn) for conn in connections))
+    finally:
+        for conn in connections:
+            await pool.release(conn)
+
+async def prepare_hot_statements(conn: Connection):
+    await get_statistic(conn)
+    await get_students(conn, limit=1)
+    await get_courses(conn, limit=1)
+    await get_teachers(conn, limit=1)
+    await get_student(conn, "")
+    await get_student_info(conn, "")
+    await get_course(conn, "")
+    await get_course_info(conn, "")
+    await get_class_summary(conn, "")
+    await get_user(conn, "")
+
 async def get_statistic(conn: Connection):
-    return await fetch_one(conn, "SELECT * FROM get_statistics();")
\ No newline at end of file
+    return await GET_STATISTICS.fetchrow(conn)
+
+async def check_statistics(conn: Connection):
+    return await CHECK_STATISTICS.fetch(conn)
+
+async def rebuild_statistics(conn: Connection):
+    await REBUILD_STATISTICS.execute(conn)
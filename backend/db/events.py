@@ -0,0 +1,96 @@
+import asyncio
+import json
+from config import EventsConfig, settings
+from .listener import listener
+
+ENROLLMENT_CHANGED_CHANNEL = "enrollment_changed"
+RESYNC = {"op": "resync"}
+
+class TooManySubscribers(Exception):
+    pass
+
+class Subscription:
+    def __init__(self, course_id: str | None, student_id: str | None, queue_size: int):
+        self.course_id = course_id
+        self.student_id = student_id
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def matches(self, event: dict) -> bool:
+        return (
+            (self.course_id is None or event.get("courseId") == self.course_id)
+            and (self.student_id is None or event.get("studentId") == self.student_id)
+        )
+
+    def push(self, event: dict) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.resync()
+            return False
+
+    def resync(self):
+        # Once a client has missed events the queued ones are no use to it: it
+        # gets a single resync and reloads whatever it shows.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESYNC)
+
+    async def next(self, timeout: float) -> dict | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+# Fans enrollment_changed notifications from the shared listener out to the
+# /events streams of this worker. A slow client only ever holds queue_size
+# events; past that its backlog is replaced by a resync.
+class EventHub:
+    def __init__(self, config: EventsConfig = settings.events):
+        self.config = config
+        self.subscriptions: set[Subscription] = set()
+        self.delivered = 0
+        self.overflows = 0
+        self.rejected = 0
+
+    def subscribe(self, course_id: str = None, student_id: str = None) -> Subscription:
+        if len(self.subscriptions) >= self.config.max_clients:
+            self.rejected += 1
+            raise TooManySubscribers("Too many event streams open")
+        subscription = Subscription(course_id, student_id, self.config.queue_size)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    def notified(self, payload: str):
+        event = json.loads(payload)
+        if event["op"] == "bulk":
+            self.resync()
+            return
+        for subscription in self.subscriptions:
+            if not subscription.matches(event):
+                continue
+            if subscription.push(event):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def resync(self):
+        for subscription in self.subscriptions:
+            subscription.resync()
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.subscriptions),
+            "maxClients": self.config.max_clients,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "rejected": self.rejected,
+            "listening": listener.connected,
+        }
+
+event_hub = EventHub()
+listener.subscribe(ENROLLMENT_CHANGED_CHANNEL, event_hub.notified)
+listener.on_reset(event_hub.resync)
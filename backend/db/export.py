@@ -0,0 +1,50 @@
+from asyncpg import Connection
+from .base import iterate
+
+STUDENT_COLUMNS = ["student_id", "name", "sex", "entrance_age", "entrance_year", "class"]
+COURSE_COLUMNS = ["course_id", "name", "credit", "grade", "canceled_year"]
+COURSE_CHOOSING_COLUMNS = ["student_id", "course_id", "chosen_year", "score"]
+
+def export_students(conn: Connection, student_class: str = None, entrance_year: int = None, sex: str = None):
+    return iterate(
+        conn,
+        """
+        SELECT student_id, name, sex, entrance_age, entrance_year, class
+        FROM students
+        WHERE ($1::VARCHAR IS NULL OR class = $1)
+          AND ($2::INT IS NULL OR entrance_year = $2)
+          AND ($3::VARCHAR IS NULL OR sex = $3)
+        ORDER BY student_id;
+        """,
+        student_class,
+        entrance_year,
+        sex
+    )
+
+def export_courses(conn: Connection, canceled_year: int = None):
+    return iterate(
+        conn,
+        """
+        SELECT course_id, name, credit, grade, canceled_year
+        FROM courses
+        WHERE ($1::INT IS NULL OR canceled_year = $1)
+        ORDER BY course_id;
+        """,
+        canceled_year
+    )
+
+def export_course_choosing(conn: Connection, student_id: str = None, course_id: str = None, chosen_year: int = None):
+    return iterate(
+        conn,
+        """
+        SELECT student_id, course_id, chosen_year, score
+        FROM course_choosing
+        WHERE ($1::CHAR(10) IS NULL OR student_id = $1)
+          AND ($2::CHAR(7) IS NULL OR course_id = $2)
+          AND ($3::INT IS NULL OR chosen_year = $3)
+        ORDER BY student_id, course_id;
+        """,
+        student_id,
+        course_id,
+        chosen_year
+    )
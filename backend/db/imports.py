@@ -0,0 +1,127 @@
+from asyncpg import Connection
+from .base import fetch_all
+
+STUDENT_IMPORT_COLUMNS = ["name", "sex", "entrance_age", "entrance_year", "class"]
+COURSE_IMPORT_COLUMNS = ["name", "credit", "grade", "canceled_year"]
+COURSE_CHOOSING_IMPORT_COLUMNS = ["student_id", "course_id", "chosen_year", "score"]
+
+VALIDATE_STUDENTS = r"""
+UPDATE import_students SET error = CASE
+    WHEN name IS NULL THEN 'name is required'
+    WHEN length(name) > 100 THEN 'name is longer than 100 characters'
+    WHEN sex IS NULL OR sex NOT IN ('male', 'female') THEN 'sex must be male or female'
+    WHEN entrance_age IS NULL OR entrance_age !~ '^\d{1,3}$' THEN 'entrance_age must be an integer'
+    WHEN entrance_age::INT NOT BETWEEN 10 AND 50 THEN 'entrance_age must be between 10 and 50'
+    WHEN entrance_year IS NULL OR entrance_year !~ '^\d{4}$' THEN 'entrance_year must be a four-digit year'
+    WHEN class IS NULL THEN 'class is required'
+    WHEN length(class) > 20 THEN 'class is longer than 20 characters'
+END;
+"""
+
+INSERT_STUDENTS = """
+WITH numbered AS (
+    UPDATE import_students
+    SET new_id = 'S' || LPAD(nextval('student_id_seq')::TEXT, 9, '0')
+    WHERE error IS NULL
+    RETURNING new_id, name, sex, entrance_age, entrance_year, class
+)
+INSERT INTO students (student_id, name, sex, entrance_age, entrance_year, class)
+SELECT new_id, name, sex, entrance_age::INT, entrance_year::INT, class FROM numbered;
+"""
+
+VALIDATE_COURSES = r"""
+UPDATE import_courses SET error = CASE
+    WHEN name IS NULL THEN 'name is required'
+    WHEN length(name) > 100 THEN 'name is longer than 100 characters'
+    WHEN credit IS NULL OR credit !~ '^\d{1,4}$' THEN 'credit must be an integer'
+    WHEN credit::INT <= 0 THEN 'credit must be positive'
+    WHEN grade IS NULL OR grade !~ '^\d{1,3}(\.\d{1,2})?$' THEN 'grade must be a number with at most two decimals'
+    WHEN grade::NUMERIC > 100 THEN 'grade must be between 0 and 100'
+    WHEN canceled_year IS NOT NULL AND canceled_year !~ '^\d{4}$' THEN 'canceled_year must be a four-digit year'
+END;
+"""
+
+INSERT_COURSES = """
+WITH numbered AS (
+    UPDATE import_courses
+    SET new_id = 'C' || LPAD(nextval('course_id_seq')::TEXT, 6, '0')
+    WHERE error IS NULL
+    RETURNING new_id, name, credit, grade, canceled_year
+)
+INSERT INTO courses (course_id, name, credit, grade, canceled_year)
+SELECT new_id, name, credit::INT, grade::NUMERIC, canceled_year::INT FROM numbered;
+"""
+
+VALIDATE_COURSE_CHOOSING = r"""
+WITH checked AS (
+    SELECT
+        i.row_number,
+        CASE
+            WHEN i.student_id IS NULL THEN 'student_id is required'
+            WHEN i.course_id IS NULL THEN 'course_id is required'
+            WHEN s.student_id IS NULL THEN 'unknown student_id'
+            WHEN c.course_id IS NULL THEN 'unknown course_id'
+            WHEN i.chosen_year IS NULL OR i.chosen_year !~ '^\d{4}$' THEN 'chosen_year must be a four-digit year'
+            WHEN i.score IS NOT NULL AND i.score !~ '^\d{1,3}(\.\d{1,2})?$' THEN 'score must be a number with at most two decimals'
+            WHEN i.score::NUMERIC > 100 THEN 'score must be between 0 and 100'
+            WHEN cc.student_id IS NOT NULL THEN 'enrollment already exists'
+            WHEN row_number() OVER (PARTITION BY i.student_id, i.course_id ORDER BY i.row_number) > 1 THEN 'duplicate enrollment in file'
+        END AS error
+    FROM import_course_choosing i
+    LEFT JOIN students s ON s.student_id = i.student_id
+    LEFT JOIN courses c ON c.course_id = i.course_id
+    LEFT JOIN course_choosing cc ON cc.student_id = i.student_id AND cc.course_id = i.course_id
+)
+UPDATE import_course_choosing i
+SET error = checked.error
+FROM checked
+WHERE checked.row_number = i.row_number
+  AND checked.error IS NOT NULL;
+"""
+
+INSERT_COURSE_CHOOSING = """
+INSERT INTO course_choosing (student_id, course_id, chosen_year, score)
+SELECT student_id, course_id, chosen_year::INT, score::NUMERIC
+FROM import_course_choosing
+WHERE error IS NULL
+ON CONFLICT DO NOTHING;
+"""
+
+async def create_staging_table(conn: Connection, table: str, columns: list[str]):
+    column_definitions = ", ".join(f"{column} TEXT" for column in columns)
+    await conn.execute(
+        f"CREATE TEMP TABLE {table} (row_number INT PRIMARY KEY, {column_definitions}, new_id TEXT, error TEXT) ON COMMIT DROP;"
+    )
+
+async def load_staging_table(conn: Connection, table: str, columns: list[str], records: list[tuple]):
+    await create_staging_table(conn, table, columns)
+    await conn.copy_records_to_table(table, records=records, columns=["row_number", *columns])
+
+async def staging_report(conn: Connection, table: str):
+    return await fetch_all(
+        conn,
+        f"SELECT row_number, new_id, error FROM {table} ORDER BY row_number;"
+    )
+
+async def run_import(conn: Connection, table: str, columns: list[str], records: list[tuple], validate: str, insert: str):
+    async with conn.transaction():
+        await load_staging_table(conn, table, columns, records)
+        await conn.execute(validate)
+        await conn.execute(insert)
+        return await staging_report(conn, table)
+
+async def import_students(conn: Connection, records: list[tuple]):
+    return await run_import(conn, "import_students", STUDENT_IMPORT_COLUMNS, records, VALIDATE_STUDENTS, INSERT_STUDENTS)
+
+async def import_courses(conn: Connection, records: list[tuple]):
+    return await run_import(conn, "import_courses", COURSE_IMPORT_COLUMNS, records, VALIDATE_COURSES, INSERT_COURSES)
+
+async def import_course_choosing(conn: Connection, records: list[tuple]):
+    return await run_import(
+        conn,
+        "import_course_choosing",
+        COURSE_CHOOSING_IMPORT_COLUMNS,
+        records,
+        VALIDATE_COURSE_CHOOSING,
+        INSERT_COURSE_CHOOSING
+    )
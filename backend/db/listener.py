@@ -0,0 +1,77 @@
+import asyncio
+from asyncpg import Connection, connect
+from config import DBConfig, settings
+
+# One LISTEN connection per worker, outside the pool, shared by every subscriber.
+class Listener:
+    def __init__(self, config: DBConfig = settings.database):
+        self.config = config
+        self.conn: Connection | None = None
+        self.callbacks: dict[str, list] = {}
+        self.reset_callbacks: list = []
+        self.reconnect_task: asyncio.Task | None = None
+        self.closing = False
+
+    @property
+    def connected(self) -> bool:
+        return self.conn is not None and not self.conn.is_closed()
+
+    def subscribe(self, channel: str, callback):
+        self.callbacks.setdefault(channel, []).append(callback)
+
+    def on_reset(self, callback):
+        # Called whenever notifications may have been missed: the connection
+        # dropped, or it was (re)established.
+        self.reset_callbacks.append(callback)
+
+    async def start(self):
+        self.closing = False
+        await self.connect()
+
+    async def connect(self):
+        conn = await connect(
+            user=self.config.user,
+            password=self.config.password,
+            database=self.config.dbname,
+            host=self.config.host,
+            port=self.config.port
+        )
+        for channel in self.callbacks:
+            await conn.add_listener(channel, self.dispatch)
+        conn.add_termination_listener(self.lost)
+        self.conn = conn
+        self.reset()
+
+    def dispatch(self, conn: Connection, pid: int, channel: str, payload: str):
+        for callback in self.callbacks.get(channel, []):
+            callback(payload)
+
+    def reset(self):
+        for callback in self.reset_callbacks:
+            callback()
+
+    def lost(self, conn: Connection):
+        self.conn = None
+        self.reset()
+        if not self.closing:
+            self.reconnect_task = asyncio.get_running_loop().create_task(self.reconnect())
+
+    async def reconnect(self):
+        delay = 0.5
+        while not self.closing:
+            try:
+                await self.connect()
+                return
+            except Exception:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def stop(self):
+        self.closing = True
+        if self.reconnect_task:
+            self.reconnect_task.cancel()
+        if self.conn:
+            await self.conn.close()
+            self.conn = None
+
+listener = Listener()
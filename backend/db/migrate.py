@@ -0,0 +1,46 @@
+import re
+from pathlib import Path
+from asyncpg import Connection
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+# Arbitrary key for pg_advisory_xact_lock, so workers starting together migrate one at a time.
+MIGRATION_LOCK = 20140001
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+def load_migrations() -> list[tuple[int, str, Path]]:
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            raise ValueError(f"Migration file {path.name} must be named <version>_<name>.sql")
+        migrations.append((int(match.group(1)), match.group(2), path))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Migration versions must be unique")
+    return migrations
+
+async def get_applied_versions(conn: Connection) -> set[int]:
+    return {row["version"] for row in await conn.fetch("SELECT version FROM schema_migrations;")}
+
+async def migrate(conn: Connection) -> list[str]:
+    applied = []
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1);", MIGRATION_LOCK)
+        await conn.execute(CREATE_MIGRATIONS_TABLE)
+        done = await get_applied_versions(conn)
+        for version, name, path in load_migrations():
+            if version in done:
+                continue
+            await conn.execute(path.read_text(encoding="utf-8"))
+            await conn.execute("INSERT INTO schema_migrations (version, name) VALUES ($1, $2);", version, name)
+            applied.append(path.name)
+    return applied
@@ -0,0 +1,14 @@
+-- Lookups by the second column of a composite primary key and by foreign keys
+-- (which ON DELETE CASCADE also scans) need their own indexes. students (class)
+-- is already covered by idx_students_class from the init script.
+
+CREATE INDEX IF NOT EXISTS idx_course_choosing_course ON course_choosing (course_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_course_teacher_teacher ON course_teacher (teacher_id, course_id);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users (role);
+CREATE INDEX IF NOT EXISTS idx_users_student ON users (student_id) WHERE student_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_users_teacher ON users (teacher_id) WHERE teacher_id IS NOT NULL;
+
+ANALYZE students;
+ANALYZE course_choosing;
+ANALYZE course_teacher;
+ANALYZE users;
@@ -0,0 +1,383 @@
+-- Read functions as single-statement LANGUAGE sql STABLE functions: the planner
+-- inlines them into the calling query, so parameters, predicates and LIMITs are
+-- planned together with the tables instead of behind an opaque PL/pgSQL call.
+
+CREATE OR REPLACE FUNCTION get_students()
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR
+) AS $$
+    SELECT * FROM students ORDER BY students.student_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_students_page(
+    p_after CHAR(10),
+    p_limit INT,
+    p_class VARCHAR,
+    p_entrance_year INT,
+    p_sex VARCHAR
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR
+) AS $$
+    SELECT * FROM students s
+    WHERE (p_after IS NULL OR s.student_id > p_after)
+      AND (p_class IS NULL OR s.class = p_class)
+      AND (p_entrance_year IS NULL OR s.entrance_year = p_entrance_year)
+      AND (p_sex IS NULL OR s.sex = p_sex)
+    ORDER BY s.student_id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_student(
+    p_student_id CHAR(10)
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR
+) AS $$
+    SELECT * FROM students s WHERE s.student_id = p_student_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_student_info(
+    p_student_id CHAR(10)
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR,
+    average_score NUMERIC,
+    weighted_average_score NUMERIC,
+    course_count INT,
+    courses JSON
+) AS $$
+    SELECT
+        s.student_id,
+        s.name,
+        s.sex,
+        s.entrance_age,
+        s.entrance_year,
+        s.class,
+        COALESCE(agg.average_score, 0),
+        COALESCE(agg.weighted_average_score, 0),
+        agg.course_count,
+        COALESCE(agg.courses, '[]'::JSON)
+    FROM students s
+    CROSS JOIN LATERAL (
+        SELECT
+            AVG(cc.score) AS average_score,
+            SUM(cc.score * c.credit) / NULLIF(SUM(c.credit) FILTER (WHERE cc.score IS NOT NULL), 0) AS weighted_average_score,
+            COUNT(*)::INT AS course_count,
+            json_agg(json_build_object(
+                'id', c.course_id,
+                'name', c.name,
+                'credit', c.credit,
+                'chosenYear', cc.chosen_year,
+                'score', cc.score
+            ) ORDER BY c.course_id) AS courses
+        FROM course_choosing cc
+        JOIN courses c ON c.course_id = cc.course_id
+        WHERE cc.student_id = s.student_id
+    ) agg
+    WHERE s.student_id = p_student_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_student_courses(p_student_id CHAR(10))
+RETURNS TABLE (
+    id CHAR(7),
+    name VARCHAR(100),
+    credit INT,
+    chosen_year INT,
+    score NUMERIC(5,2)
+) AS $$
+    SELECT
+        c.course_id AS id,
+        c.name,
+        c.credit,
+        cc.chosen_year,
+        cc.score
+    FROM course_choosing cc
+    JOIN courses c ON cc.course_id = c.course_id
+    WHERE cc.student_id = p_student_id
+    ORDER BY c.course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_students_average_score_by_class(
+    p_class VARCHAR
+)
+RETURNS NUMERIC(5,2) AS $$
+    SELECT ROUND(AVG(cc.score), 2)
+    FROM students s
+    JOIN course_choosing cc ON s.student_id = cc.student_id
+    WHERE s.class = p_class;
+$$ LANGUAGE sql STABLE;
+
+-- Joining course_choosing directly (instead of pre-aggregating it per student for
+-- every student) lets a single-class lookup go through idx_students_class and the
+-- course_choosing primary key.
+CREATE OR REPLACE FUNCTION get_class_summaries(
+    p_class VARCHAR
+)
+RETURNS TABLE (
+    class VARCHAR,
+    student_count INT,
+    average_score NUMERIC(5,2),
+    min_score NUMERIC(5,2),
+    max_score NUMERIC(5,2),
+    enrollment_count INT
+) AS $$
+    SELECT
+        s.class,
+        COUNT(DISTINCT s.student_id)::INT,
+        ROUND(AVG(cc.score), 2),
+        MIN(cc.score),
+        MAX(cc.score),
+        COUNT(cc.student_id)::INT
+    FROM students s
+    LEFT JOIN course_choosing cc ON cc.student_id = s.student_id
+    WHERE p_class IS NULL OR s.class = p_class
+    GROUP BY s.class
+    ORDER BY s.class;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_teacher(
+    p_teacher_id CHAR(5)
+)
+RETURNS TABLE (
+    teacher_id CHAR(5),
+    name VARCHAR
+) AS $$
+    SELECT * FROM teachers t WHERE t.teacher_id = p_teacher_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_teachers()
+RETURNS TABLE (
+    teacher_id CHAR(5),
+    name VARCHAR
+) AS $$
+    SELECT * FROM teachers ORDER BY teachers.teacher_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_teachers_page(
+    p_after CHAR(5),
+    p_limit INT
+)
+RETURNS TABLE (
+    teacher_id CHAR(5),
+    name VARCHAR
+) AS $$
+    SELECT * FROM teachers t
+    WHERE (p_after IS NULL OR t.teacher_id > p_after)
+    ORDER BY t.teacher_id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION teaches_course(
+    p_teacher_id CHAR(5),
+    p_course_id CHAR(7)
+)
+RETURNS BOOLEAN AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM course_teacher ct
+        WHERE ct.teacher_id = p_teacher_id
+          AND ct.course_id = p_course_id
+    );
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_courses()
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT
+) AS $$
+    SELECT * FROM courses ORDER BY courses.course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_courses_page(
+    p_after CHAR(7),
+    p_limit INT,
+    p_canceled_year INT
+)
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT
+) AS $$
+    SELECT * FROM courses c
+    WHERE (p_after IS NULL OR c.course_id > p_after)
+      AND (p_canceled_year IS NULL OR c.canceled_year = p_canceled_year)
+    ORDER BY c.course_id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_course_choosings()
+RETURNS TABLE (
+    student_id CHAR(10),
+    course_id CHAR(7),
+    chosen_year INT,
+    score NUMERIC
+) AS $$
+    SELECT * FROM course_choosing ORDER BY course_choosing.student_id, course_choosing.course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_course(p_course_id CHAR(7))
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT
+) AS $$
+    SELECT * FROM courses c WHERE c.course_id = p_course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_course_info(
+    p_course_id CHAR(7)
+)
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT,
+    average_score NUMERIC,
+    student_count INT,
+    students JSON
+) AS $$
+    SELECT
+        c.course_id,
+        c.name,
+        c.credit,
+        c.grade,
+        c.canceled_year,
+        COALESCE(agg.average_score, 0),
+        agg.student_count,
+        COALESCE(agg.students, '[]'::JSON)
+    FROM courses c
+    CROSS JOIN LATERAL (
+        SELECT
+            AVG(cc.score) AS average_score,
+            COUNT(*)::INT AS student_count,
+            json_agg(json_build_object(
+                'id', s.student_id,
+                'name', s.name,
+                'score', cc.score,
+                'chosenYear', cc.chosen_year
+            ) ORDER BY s.student_id) AS students
+        FROM course_choosing cc
+        JOIN students s ON s.student_id = cc.student_id
+        WHERE cc.course_id = c.course_id
+    ) agg
+    WHERE c.course_id = p_course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_course_scores(p_course_id CHAR(7))
+RETURNS TABLE (
+    student_id CHAR(10),
+    student_name VARCHAR,
+    score NUMERIC(5,2),
+    chosen_year INT
+) AS $$
+    SELECT
+        s.student_id,
+        s.name,
+        cc.score,
+        cc.chosen_year
+    FROM course_choosing cc
+    JOIN students s ON cc.student_id = s.student_id
+    WHERE cc.course_id = p_course_id
+    ORDER BY s.student_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_courses_by_teacher(
+    p_teacher_id CHAR(5)
+)
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT
+) AS $$
+    SELECT
+        c.course_id,
+        c.name,
+        c.credit,
+        c.grade,
+        c.canceled_year
+    FROM course_teacher ct
+    JOIN courses c ON c.course_id = ct.course_id
+    WHERE ct.teacher_id = p_teacher_id
+    ORDER BY c.course_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_user(
+    p_username VARCHAR
+)
+RETURNS TABLE (
+    username VARCHAR,
+    password TEXT,
+    role VARCHAR,
+    student_id CHAR(10),
+    teacher_id CHAR(5)
+) AS $$
+    SELECT
+        u.username,
+        u.password_hash AS password,
+        u.role,
+        u.student_id,
+        u.teacher_id
+    FROM users u
+    WHERE u.username = p_username;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_statistics()
+RETURNS TABLE (
+    total_students INT,
+    total_teachers INT,
+    total_courses INT,
+    total_classes INT,
+    average_score NUMERIC(5,2)
+) AS $$
+    SELECT
+        SUM(c.total_students)::INT,
+        SUM(c.total_teachers)::INT,
+        SUM(c.total_courses)::INT,
+        (SELECT COUNT(*)::INT FROM class_statistics),
+        ROUND(SUM(c.score_sum) / NULLIF(SUM(c.score_count), 0), 2)
+    FROM statistics_counters c;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_admin_users()
+RETURNS TABLE (
+    user_id INT,
+    username VARCHAR,
+    role VARCHAR
+) AS $$
+    SELECT
+        u.user_id,
+        u.username,
+        u.role
+    FROM users u
+    WHERE u.role = 'admin';
+$$ LANGUAGE sql STABLE;
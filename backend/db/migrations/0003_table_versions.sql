@@ -0,0 +1,61 @@
+-- Per-table write counters for conditional GETs. Like statistics_counters they are
+-- sharded by backend slot, so concurrent writers do not queue on one row; a
+-- table's version is the sum of its slots and only ever grows.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT NOT NULL,
+    slot SMALLINT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, slot)
+);
+
+INSERT INTO table_versions (table_name, slot)
+SELECT t.table_name, s.slot
+FROM unnest(ARRAY['students', 'teachers', 'courses', 'course_teacher', 'course_choosing']) AS t(table_name)
+CROSS JOIN generate_series(0, 15) AS s(slot)
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1
+    WHERE table_name = TG_TABLE_NAME
+      AND slot = statistics_slot();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION get_table_versions(
+    p_tables TEXT[]
+)
+RETURNS TABLE (
+    table_name TEXT,
+    version BIGINT
+) AS $$
+    SELECT v.table_name, SUM(v.version)::BIGINT
+    FROM table_versions v
+    WHERE v.table_name = ANY(p_tables)
+    GROUP BY v.table_name
+    ORDER BY v.table_name;
+$$ LANGUAGE sql STABLE;
+
+CREATE TRIGGER students_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON students
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER teachers_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON teachers
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER courses_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON courses
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER course_teacher_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON course_teacher
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER course_choosing_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON course_choosing
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
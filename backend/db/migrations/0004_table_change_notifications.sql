@@ -0,0 +1,15 @@
+-- Announce committed writes on the table_changed channel so every worker can drop
+-- what it cached from that table. NOTIFY is delivered on commit and folded to one
+-- message per table and transaction.
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1
+    WHERE table_name = TG_TABLE_NAME
+      AND slot = statistics_slot();
+    PERFORM pg_notify('table_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,68 @@
+-- Publish committed enrollment and score changes on the enrollment_changed channel
+-- for the /events stream. One message per changed row; a statement touching more
+-- rows than is worth streaming (imports, seeding, a deleted course's cascade)
+-- sends a single {"op": "bulk"} instead and listeners refetch.
+
+CREATE OR REPLACE FUNCTION notify_enrollment_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_changes JSON[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(json_build_object(
+            'op', 'insert', 'studentId', n.student_id, 'courseId', n.course_id,
+            'chosenYear', n.chosen_year, 'score', n.score
+        ))
+        INTO v_changes
+        FROM (SELECT * FROM new_rows LIMIT 101) n;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(json_build_object(
+            'op', 'update', 'studentId', n.student_id, 'courseId', n.course_id,
+            'chosenYear', n.chosen_year, 'score', n.score
+        ))
+        INTO v_changes
+        FROM (
+            SELECT n.*
+            FROM new_rows n
+            JOIN old_rows o USING (student_id, course_id)
+            WHERE n.score IS DISTINCT FROM o.score
+               OR n.chosen_year IS DISTINCT FROM o.chosen_year
+            LIMIT 101
+        ) n;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(json_build_object(
+            'op', 'delete', 'studentId', o.student_id, 'courseId', o.course_id,
+            'chosenYear', o.chosen_year, 'score', o.score
+        ))
+        INTO v_changes
+        FROM (SELECT * FROM old_rows LIMIT 101) o;
+    END IF;
+
+    IF TG_OP = 'TRUNCATE' OR cardinality(v_changes) > 100 THEN
+        PERFORM pg_notify('enrollment_changed', '{"op": "bulk"}');
+    ELSIF v_changes IS NOT NULL THEN
+        PERFORM pg_notify('enrollment_changed', c::text) FROM unnest(v_changes) AS c;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER course_choosing_notify_insert
+AFTER INSERT ON course_choosing
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_enrollment_changes();
+
+CREATE TRIGGER course_choosing_notify_update
+AFTER UPDATE ON course_choosing
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_enrollment_changes();
+
+CREATE TRIGGER course_choosing_notify_delete
+AFTER DELETE ON course_choosing
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_enrollment_changes();
+
+CREATE TRIGGER course_choosing_notify_truncate
+AFTER TRUNCATE ON course_choosing
+FOR EACH STATEMENT EXECUTE FUNCTION notify_enrollment_changes();
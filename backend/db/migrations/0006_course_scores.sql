@@ -0,0 +1,65 @@
+-- Grade a whole course in one statement. Rows are matched to enrollments by
+-- position in the arrays and each gets a status: unknown (not enrolled),
+-- out_of_range, conflict (p_check_previous was set and the stored score no
+-- longer equals p_previous_scores) or updated. Only updated rows are written;
+-- the returned score is the new one for those and the stored one otherwise.
+
+CREATE OR REPLACE FUNCTION set_course_scores(
+    p_course_id CHAR(7),
+    p_student_ids CHAR(10)[],
+    p_scores NUMERIC[],
+    p_previous_scores NUMERIC[],
+    p_check_previous BOOLEAN[]
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    status TEXT,
+    score NUMERIC(5,2)
+) AS $$
+    -- Lock in key order first, so two graders submitting overlapping lists
+    -- queue behind each other instead of deadlocking, and the checks below see
+    -- the winner's scores.
+    SELECT 1
+    FROM course_choosing cc
+    WHERE cc.course_id = p_course_id
+      AND cc.student_id = ANY(p_student_ids)
+    ORDER BY cc.student_id
+    FOR UPDATE;
+
+    WITH input AS (
+        SELECT *
+        FROM unnest(p_student_ids, p_scores, p_previous_scores, p_check_previous)
+            WITH ORDINALITY AS i(student_id, score, previous_score, check_previous, position)
+    ),
+    checked AS (
+        SELECT
+            i.position,
+            i.student_id,
+            round(i.score, 2) AS score,
+            cc.score AS current_score,
+            CASE
+                WHEN cc.student_id IS NULL THEN 'unknown'
+                WHEN round(i.score, 2) NOT BETWEEN 0 AND 100 THEN 'out_of_range'
+                WHEN i.check_previous AND cc.score IS DISTINCT FROM round(i.previous_score, 2) THEN 'conflict'
+                ELSE 'updated'
+            END AS status
+        FROM input i
+        LEFT JOIN course_choosing cc
+          ON cc.course_id = p_course_id
+         AND cc.student_id = i.student_id
+    ),
+    updated AS (
+        UPDATE course_choosing cc
+        SET score = c.score
+        FROM checked c
+        WHERE c.status = 'updated'
+          AND cc.course_id = p_course_id
+          AND cc.student_id = c.student_id
+    )
+    SELECT
+        c.student_id,
+        c.status,
+        CASE WHEN c.status = 'updated' THEN c.score ELSE c.current_score END
+    FROM checked c
+    ORDER BY c.position;
+$$ LANGUAGE sql;
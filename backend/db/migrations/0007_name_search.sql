@@ -0,0 +1,68 @@
+-- Typeahead over student, teacher and course names. GiST trigram indexes serve
+-- both the word-similarity filter (<%) and the distance ordering (<<->), so the
+-- top matches come straight off the index without ranking every candidate.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_students_name_trgm ON students USING gist (name gist_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_teachers_name_trgm ON teachers USING gist (name gist_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_courses_name_trgm ON courses USING gist (name gist_trgm_ops);
+
+CREATE OR REPLACE FUNCTION search_names(
+    p_query TEXT,
+    p_kinds TEXT[],
+    p_limit INT
+)
+RETURNS TABLE (
+    kind TEXT,
+    id TEXT,
+    name TEXT,
+    similarity REAL
+) AS $$
+    (
+        SELECT 'student', s.student_id::TEXT, s.name::TEXT, word_similarity(p_query, s.name)
+        FROM students s
+        WHERE 'student' = ANY(p_kinds)
+          AND p_query <% s.name
+        ORDER BY p_query <<-> s.name
+        LIMIT p_limit
+    )
+    UNION ALL
+    (
+        SELECT 'teacher', t.teacher_id::TEXT, t.name::TEXT, word_similarity(p_query, t.name)
+        FROM teachers t
+        WHERE 'teacher' = ANY(p_kinds)
+          AND p_query <% t.name
+        ORDER BY p_query <<-> t.name
+        LIMIT p_limit
+    )
+    UNION ALL
+    (
+        SELECT 'course', c.course_id::TEXT, c.name::TEXT, word_similarity(p_query, c.name)
+        FROM courses c
+        WHERE 'course' = ANY(p_kinds)
+          AND p_query <% c.name
+        ORDER BY p_query <<-> c.name
+        LIMIT p_limit
+    );
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION search_ids(
+    p_id TEXT
+)
+RETURNS TABLE (
+    kind TEXT,
+    id TEXT,
+    name TEXT,
+    similarity REAL
+) AS $$
+    SELECT 'student', s.student_id::TEXT, s.name::TEXT, 1::REAL FROM students s WHERE s.student_id = p_id
+    UNION ALL
+    SELECT 'teacher', t.teacher_id::TEXT, t.name::TEXT, 1::REAL FROM teachers t WHERE t.teacher_id = p_id
+    UNION ALL
+    SELECT 'course', c.course_id::TEXT, c.name::TEXT, 1::REAL FROM courses c WHERE c.course_id = p_id;
+$$ LANGUAGE sql STABLE;
+
+ANALYZE students;
+ANALYZE teachers;
+ANALYZE courses;
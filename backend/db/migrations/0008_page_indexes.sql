@@ -0,0 +1,15 @@
+-- List pages are now built per cursor/filter combination in db/queries.py
+-- (Page), so the catch-all page functions are no longer called. Filtering by
+-- entrance year or canceled year walks these indexes from the cursor on instead
+-- of the primary key with a filter. students (class, student_id) already exists;
+-- sex matches about half of the students and is left to the primary key scan.
+
+CREATE INDEX IF NOT EXISTS idx_students_entrance_year ON students (entrance_year, student_id);
+CREATE INDEX IF NOT EXISTS idx_courses_canceled_year ON courses (canceled_year, course_id);
+
+DROP FUNCTION IF EXISTS get_students_page(CHAR, INT, VARCHAR, INT, VARCHAR);
+DROP FUNCTION IF EXISTS get_courses_page(CHAR, INT, INT);
+DROP FUNCTION IF EXISTS get_teachers_page(CHAR, INT);
+
+ANALYZE students;
+ANALYZE courses;
@@ -0,0 +1,34 @@
+-- A scalar SQL function is only inlined when its body is a plain expression.
+-- These two run a query (an aggregate, an EXISTS), so each call went through an
+-- opaque function call planned apart from the caller. Returned as a one-row
+-- table and called in FROM, they are inlined like the other read functions.
+
+DROP FUNCTION IF EXISTS get_students_average_score_by_class(VARCHAR);
+
+CREATE FUNCTION get_students_average_score_by_class(
+    p_class VARCHAR
+)
+RETURNS TABLE (
+    average_score NUMERIC(5,2)
+) AS $$
+    SELECT ROUND(AVG(cc.score), 2)
+    FROM students s
+    JOIN course_choosing cc ON s.student_id = cc.student_id
+    WHERE s.class = p_class;
+$$ LANGUAGE sql STABLE;
+
+DROP FUNCTION IF EXISTS teaches_course(CHAR, CHAR);
+
+CREATE FUNCTION teaches_course(
+    p_teacher_id CHAR(5),
+    p_course_id CHAR(7)
+)
+RETURNS TABLE (
+    teaches BOOLEAN
+) AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM course_teacher ct
+        WHERE ct.teacher_id = p_teacher_id
+          AND ct.course_id = p_course_id
+    );
+$$ LANGUAGE sql STABLE;
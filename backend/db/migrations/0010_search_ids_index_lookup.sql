@@ -0,0 +1,20 @@
+-- The ids are CHAR columns: compared with the TEXT parameter they are cast to
+-- text, which the primary key indexes cannot serve, so each branch scanned its
+-- whole table. Casting the parameter to bpchar keeps the comparison on the
+-- column's own type and every branch an index probe.
+
+CREATE OR REPLACE FUNCTION search_ids(
+    p_id TEXT
+)
+RETURNS TABLE (
+    kind TEXT,
+    id TEXT,
+    name TEXT,
+    similarity REAL
+) AS $$
+    SELECT 'student', s.student_id::TEXT, s.name::TEXT, 1::REAL FROM students s WHERE s.student_id = p_id::bpchar
+    UNION ALL
+    SELECT 'teacher', t.teacher_id::TEXT, t.name::TEXT, 1::REAL FROM teachers t WHERE t.teacher_id = p_id::bpchar
+    UNION ALL
+    SELECT 'course', c.course_id::TEXT, c.name::TEXT, 1::REAL FROM courses c WHERE c.course_id = p_id::bpchar;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,53 @@
+-- get_class_summaries(p_class) served both the full list (NULL) and one class
+-- behind "p_class IS NULL OR s.class = p_class". Once the prepared statement
+-- switches to its generic plan that predicate cannot use idx_students_class,
+-- and a single-class lookup aggregates every class. Each caller gets its own
+-- function instead.
+
+DROP FUNCTION IF EXISTS get_class_summaries(VARCHAR);
+
+CREATE FUNCTION get_class_summaries()
+RETURNS TABLE (
+    class VARCHAR,
+    student_count INT,
+    average_score NUMERIC(5,2),
+    min_score NUMERIC(5,2),
+    max_score NUMERIC(5,2),
+    enrollment_count INT
+) AS $$
+    SELECT
+        s.class,
+        COUNT(DISTINCT s.student_id)::INT,
+        ROUND(AVG(cc.score), 2),
+        MIN(cc.score),
+        MAX(cc.score),
+        COUNT(cc.student_id)::INT
+    FROM students s
+    LEFT JOIN course_choosing cc ON cc.student_id = s.student_id
+    GROUP BY s.class
+    ORDER BY s.class;
+$$ LANGUAGE sql STABLE;
+
+CREATE FUNCTION get_class_summary(
+    p_class VARCHAR
+)
+RETURNS TABLE (
+    class VARCHAR,
+    student_count INT,
+    average_score NUMERIC(5,2),
+    min_score NUMERIC(5,2),
+    max_score NUMERIC(5,2),
+    enrollment_count INT
+) AS $$
+    SELECT
+        s.class,
+        COUNT(DISTINCT s.student_id)::INT,
+        ROUND(AVG(cc.score), 2),
+        MIN(cc.score),
+        MAX(cc.score),
+        COUNT(cc.student_id)::INT
+    FROM students s
+    LEFT JOIN course_choosing cc ON cc.student_id = s.student_id
+    WHERE s.class = p_class
+    GROUP BY s.class;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,135 @@
+import json
+import re
+from decimal import Decimal
+from asyncpg import Connection
+from .classes import GET_CLASS_AVERAGE_SCORE, GET_CLASS_SUMMARY
+from .courses import COURSES_PAGE, GET_COURSE, GET_COURSE_INFO, GET_COURSE_SCORES
+from .queries import Query
+from .search import SEARCH_IDS
+from .students import GET_STUDENT, GET_STUDENT_COURSES, GET_STUDENT_INFO, STUDENTS_PAGE
+from .teachers import GET_COURSES_BY_TEACHER, GET_TEACHER, TEACHERS_PAGE, TEACHES_COURSE
+from .user import GET_ADMIN_USERS, GET_USER
+
+# Tables smaller than this are cheaper to scan than to probe, so a seq scan on
+# them is not a regression.
+MIN_CHECKED_ROWS = 10000
+
+# Each hot query with a statement picking realistic arguments from the data.
+HOT_QUERIES: list[tuple[Query, str | None]] = [
+    (STUDENTS_PAGE.query(False, []), "SELECT 50"),
+    (STUDENTS_PAGE.query(True, []), "SELECT MAX(student_id), 50 FROM (SELECT student_id FROM students ORDER BY student_id LIMIT 1000) s"),
+    (STUDENTS_PAGE.query(False, ["class"]), "SELECT class, 50 FROM students LIMIT 1"),
+    (
+        STUDENTS_PAGE.query(True, ["class"]),
+        "SELECT MAX(student_id), class, 50 FROM (SELECT student_id, class FROM students WHERE class = (SELECT class FROM students LIMIT 1) ORDER BY student_id LIMIT 20) s GROUP BY class"
+    ),
+    (
+        STUDENTS_PAGE.query(True, ["entrance_year"]),
+        "SELECT MAX(student_id), entrance_year, 50 FROM (SELECT student_id, entrance_year FROM students WHERE entrance_year = (SELECT entrance_year FROM students LIMIT 1) ORDER BY student_id LIMIT 1000) s GROUP BY entrance_year"
+    ),
+    (GET_STUDENT, "SELECT student_id FROM students LIMIT 1"),
+    (GET_STUDENT_INFO, "SELECT student_id FROM students LIMIT 1"),
+    (GET_STUDENT_COURSES, "SELECT student_id FROM course_choosing LIMIT 1"),
+    (GET_CLASS_AVERAGE_SCORE, "SELECT class FROM students LIMIT 1"),
+    (GET_CLASS_SUMMARY, "SELECT class FROM students LIMIT 1"),
+    (COURSES_PAGE.query(False, []), "SELECT 50"),
+    (GET_COURSE, "SELECT course_id FROM courses LIMIT 1"),
+    (GET_COURSE_INFO, "SELECT course_id FROM course_choosing LIMIT 1"),
+    (GET_COURSE_SCORES, "SELECT course_id FROM course_choosing LIMIT 1"),
+    (TEACHERS_PAGE.query(False, []), "SELECT 50"),
+    (GET_TEACHER, "SELECT teacher_id FROM teachers LIMIT 1"),
+    (GET_COURSES_BY_TEACHER, "SELECT teacher_id FROM course_teacher LIMIT 1"),
+    (TEACHES_COURSE, "SELECT teacher_id, course_id FROM course_teacher LIMIT 1"),
+    (SEARCH_IDS, "SELECT student_id::TEXT FROM students LIMIT 1"),
+    (GET_USER, "SELECT username FROM users LIMIT 1"),
+    (GET_ADMIN_USERS, None),
+]
+
+def called_functions(plan: dict, functions: set[str]) -> set[str]:
+    # A scalar function that was not inlined has no plan node of its own; it
+    # only shows up by name in the node's expressions (EXPLAIN VERBOSE).
+    expressions = []
+    for key, value in plan.items():
+        if key == "Plans":
+            continue
+        if isinstance(value, str):
+            expressions.append(value)
+        elif isinstance(value, list):
+            expressions.extend(item for item in value if isinstance(item, str))
+    return {name for name in re.findall(r"(\w+)\(", " ".join(expressions)) if name in functions}
+
+def find_problems(plan: dict, large_tables: set[str], functions: set[str]) -> list[str]:
+    problems = []
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan" and plan.get("Relation Name") in large_tables:
+        problems.append(f"seq scan on {plan['Relation Name']}")
+    if node_type == "Function Scan":
+        problems.append(f"function {plan.get('Function Name')} was not inlined")
+    for name in sorted(called_functions(plan, functions)):
+        problems.append(f"function {name} was not inlined")
+    for child in plan.get("Plans", []):
+        problems.extend(find_problems(child, large_tables, functions))
+    return problems
+
+async def get_large_tables(conn: Connection) -> set[str]:
+    rows = await conn.fetch(
+        "SELECT relname FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace AND reltuples >= $1;",
+        MIN_CHECKED_ROWS
+    )
+    return {row["relname"] for row in rows}
+
+async def get_functions(conn: Connection) -> set[str]:
+    # The schema's own functions, leaving out those of extensions (pg_trgm).
+    rows = await conn.fetch(
+        """
+        SELECT p.proname FROM pg_proc p
+        WHERE p.pronamespace = 'public'::regnamespace
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_depend d
+              WHERE d.classid = 'pg_proc'::regclass AND d.objid = p.oid AND d.deptype = 'e'
+          );
+        """
+    )
+    return {row["proname"] for row in rows}
+
+def literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+async def explain(conn: Connection, query: Query, args) -> dict:
+    plan = json.loads(await conn.fetchval(f"EXPLAIN (FORMAT JSON, VERBOSE) {query.text}", *args))
+    return plan[0]["Plan"]
+
+async def explain_generic(conn: Connection, query: Query, args) -> dict:
+    # asyncpg keeps statements prepared, so after five executions the server may
+    # switch to the generic plan, planned without the parameter values. Postgres
+    # 15 has no EXPLAIN (GENERIC_PLAN): force it through plan_cache_mode on a
+    # PREPAREd copy of the statement and explain an EXECUTE of it instead.
+    execute = f"EXECUTE check_plan({', '.join(literal(arg) for arg in args)})" if args else "EXECUTE check_plan"
+    async with conn.transaction():
+        await conn.execute("SET LOCAL plan_cache_mode = force_generic_plan;")
+        await conn.execute(f"PREPARE check_plan AS {query.text}")
+        plan = json.loads(await conn.fetchval(f"EXPLAIN (FORMAT JSON, VERBOSE) {execute};"))
+        await conn.execute("DEALLOCATE check_plan;")
+    return plan[0]["Plan"]
+
+async def check_plans(conn: Connection) -> list[tuple[str, list[str] | None]]:
+    large_tables = await get_large_tables(conn)
+    functions = await get_functions(conn)
+    results = []
+    for query, arguments in HOT_QUERIES:
+        args = await conn.fetchrow(arguments) if arguments else ()
+        if args is None:
+            results.append((query.name, None))
+            continue
+        problems = find_problems(await explain(conn, query, args), large_tables, functions)
+        for problem in find_problems(await explain_generic(conn, query, args), large_tables, functions):
+            if problem not in problems:
+                problems.append(f"{problem} (generic plan)")
+        results.append((query.name, problems))
+    return results
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import Sequence
+from asyncpg import Connection, Record
+from .base import execute, fetch_all, fetch_row, fetch_val
+
+# Every query is declared once, so its text is identical on every call and
+# asyncpg's per-connection statement cache prepares it on first use and reuses
+# the prepared statement afterwards (see DB_STATEMENT_CACHE_SIZE).
+REGISTRY: dict[str, "Query"] = {}
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    sql: str
+    single_row: bool = False
+    text: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.name in REGISTRY:
+            raise ValueError(f"Query {self.name} is already registered")
+        object.__setattr__(self, "text", f"{self.sql} LIMIT 1;" if self.single_row else f"{self.sql};")
+        REGISTRY[self.name] = self
+
+    async def fetch(self, conn: Connection, *args) -> list[Record]:
+        return await fetch_all(conn, self.text, *args)
+
+    async def fetchrow(self, conn: Connection, *args) -> Record | None:
+        return await fetch_row(conn, self.text, *args)
+
+    async def fetchval(self, conn: Connection, *args):
+        return await fetch_val(conn, self.text, *args)
+
+    async def execute(self, conn: Connection, *args) -> str:
+        return await execute(conn, self.text, *args)
+
+def select(name: str, sql: str, single_row: bool = False) -> Query:
+    return Query(name, sql, single_row)
+
+def call(name: str, proc: str) -> Query:
+    return Query(name, f"CALL {proc}")
+
+@dataclass(frozen=True)
+class Page:
+    # A keyset page over one table. A catch-all "(p IS NULL OR col = p)" predicate
+    # stops matching an index range once the server switches a prepared statement
+    # to its generic plan, so every combination of cursor and filters gets its
+    # own statement holding only the predicates it uses. Filters are applied in
+    # declaration order, which keeps the combinations (2^(1 + filters)) few.
+    name: str
+    table: str
+    key: str
+    filters: tuple[str, ...] = ()
+
+    def query(self, after: bool, filters: Sequence[str], columns: tuple[str, ...] = None) -> Query:
+        used = [column for column in self.filters if column in filters]
+        name = f"{self.name}[{','.join((['after'] if after else []) + used)}]"
+        if columns:
+            name += f"({','.join(columns)})"
+        query = REGISTRY.get(name)
+        if query is None:
+            predicates = [f"{self.key} > $1"] if after else []
+            for column in used:
+                predicates.append(f'"{column}" = ${len(predicates) + 1}')
+            column_list = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+            where = f" WHERE {' AND '.join(predicates)}" if predicates else ""
+            query = Query(name, f"SELECT {column_list} FROM {self.table}{where} ORDER BY {self.key} LIMIT ${len(predicates) + 1}")
+        return query
+
+    async def fetch(self, conn: Connection, after, limit: int | None, filters: dict[str, object] = None, columns: tuple[str, ...] = None) -> list[Record]:
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        query = self.query(after is not None, list(filters), columns)
+        args = ([after] if after is not None else []) + [filters[column] for column in self.filters if column in filters]
+        return await query.fetch(conn, *args, limit)
+
+def page(name: str, table: str, key: str, filters: tuple[str, ...] = ()) -> Page:
+    return Page(name, table, key, filters)
+
+def projected(query: Query, columns: tuple[str, ...]) -> Query:
+    # A "SELECT * FROM fn(...)" query narrowed to some of its columns. The read
+    # functions are inlined, so the planner drops the work behind the others
+    # (joins, aggregates, json_agg). Every column set is registered once like any
+    # other query; callers pass columns in a fixed order to keep the sets few.
+    if not query.sql.startswith("SELECT * FROM "):
+        raise ValueError(f"Query {query.name} cannot be projected")
+    name = f"{query.name}({','.join(columns)})"
+    variant = REGISTRY.get(name)
+    if variant is None:
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        variant = Query(name, query.sql.replace("SELECT *", f"SELECT {column_list}", 1), query.single_row)
+    return variant
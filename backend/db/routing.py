@@ -0,0 +1,47 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from config import settings
+from utils.cache import TTLCache
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+@dataclass
+class Routing:
+    replica: bool
+
+current_routing: ContextVar[Routing | None] = ContextVar("current_routing", default=None)
+
+# Clients that just wrote, keyed by their Authorization header, keep reading from
+# the primary for DB_READ_YOUR_WRITES seconds so a lagging replica cannot hide
+# their own change. The window is per worker.
+recent_writers = TTLCache(10000, settings.database.read_your_writes)
+
+# Marks GET/HEAD requests as allowed to read from a replica. Anything else, and
+# requests outside HTTP (startup, cli.py), stays on the primary.
+class ReadRoutingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = dict(scope["headers"]).get(b"authorization")
+        safe = scope["method"] in SAFE_METHODS
+        routing = Routing(replica=safe and (client is None or recent_writers.get(client) is None))
+        token = current_routing.set(routing)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_routing.reset(token)
+            if client is not None and not safe and status < 400:
+                recent_writers.set(client, True)
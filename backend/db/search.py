@@ -0,0 +1,15 @@
+import re
+from asyncpg import Connection
+from .queries import select
+
+SEARCH_NAMES = select("search_names", "SELECT * FROM search_names($1, $2, $3)")
+SEARCH_IDS = select("search_ids", "SELECT * FROM search_ids($1)")
+# Ids are fixed width (S + 9 digits, T + 4, C + 6), so a query shaped like one
+# is looked up by primary key instead of matched against names.
+ID_PATTERN = re.compile(r"^(S\d{9}|T\d{4}|C\d{6})$")
+
+async def search_names(conn: Connection, query: str, kinds: list[str], limit: int):
+    return await SEARCH_NAMES.fetch(conn, query, kinds, limit)
+
+async def search_ids(conn: Connection, entity_id: str):
+    return await SEARCH_IDS.fetch(conn, entity_id)
@@ -0,0 +1,73 @@
+import asyncio
+import contextvars
+import random
+from collections import deque
+from datetime import datetime, timezone
+from config import SlowQueryConfig, settings
+
+def parameter_shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+class SlowQueryLog:
+    def __init__(self, config: SlowQueryConfig = settings.slow_queries):
+        self.config = config
+        self.threshold = config.threshold_ms / 1000 if config.threshold_ms > 0 else float("inf")
+        self.entries: deque = deque(maxlen=config.buffer_size)
+        self.pool = None
+        self.explaining = False
+        self.recorded = 0
+
+    def record(self, query: str, args: tuple, seconds: float):
+        self.recorded += 1
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "query": " ".join(query.split()),
+            "params": [parameter_shape(value) for value in args],
+            "durationMs": round(seconds * 1000, 3),
+            "plan": None,
+            "planStatus": "skipped",
+        }
+        self.entries.append(entry)
+        # EXPLAIN ANALYZE executes the statement again, so only reads are explained,
+        # only a sample of them, and at most one at a time on its own connection.
+        if (
+            self.pool is not None
+            and not self.explaining
+            and query.lstrip().upper().startswith("SELECT")
+            and random.random() < self.config.sample_rate
+        ):
+            self.explaining = True
+            entry["planStatus"] = "pending"
+            asyncio.get_running_loop().create_task(self.explain(entry, query, args), context=contextvars.Context())
+
+    async def explain(self, entry: dict, query: str, args: tuple):
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction(readonly=True):
+                    await conn.execute(f"SET LOCAL statement_timeout = {int(self.config.explain_timeout_ms)};")
+                    rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query.rstrip().rstrip(';')}", *args)
+            entry["plan"] = "\n".join(row[0] for row in rows)
+            entry["planStatus"] = "captured"
+        except Exception as e:
+            entry["planStatus"] = f"failed: {e}"
+        finally:
+            self.explaining = False
+
+    def stats(self) -> dict:
+        return {
+            "thresholdMs": self.config.threshold_ms,
+            "sampleRate": self.config.sample_rate,
+            "recorded": self.recorded,
+            "entries": list(reversed(self.entries)),
+        }
+
+    def clear(self):
+        self.entries.clear()
+
+slow_query_log = SlowQueryLog()
@@ -1,17 +1,27 @@
 from asyncpg import Connection
 from models.schemas import Student
-from .base import fetch_one, call_proc, fetch_all
-
-async def get_students(conn: Connection):
-    return await fetch_all(conn, "SELECT * FROM get_students();")
+from .queries import call, page, projected, select
+
+STUDENTS_PAGE = page("students_page", "students", "student_id", ("class", "entrance_year", "sex"))
+GET_STUDENT = select("get_student", "SELECT * FROM get_student($1)", single_row=True)
+GET_STUDENT_INFO = select("get_student_info", "SELECT * FROM get_student_info($1)", single_row=True)
+GET_STUDENT_COURSES = select("get_student_courses", "SELECT * FROM get_student_courses($1)")
+INSERT_STUDENT = call("insert_student", "insert_student($1, $2, $3, $4, $5)")
+UPDATE_STUDENT = call("update_student", "update_student($1, $2, $3, $4, $5, $6)")
+DELETE_STUDENT = call("delete_student", "delete_student($1)")
+SET_STUDENT_COURSES = call("set_student_courses", "set_student_courses($1, $2)")
+UPDATE_STUDENT_COURSE_SCORE = call("update_student_course_score", "update_student_course_score($1, $2, $3)")
+
+async def get_students(conn: Connection, after: str = None, limit: int = None, student_class: str = None, entrance_year: int = None, sex: str = None, columns: tuple[str, ...] = None):
+    filters = {"class": student_class, "entrance_year": entrance_year, "sex": sex}
+    return await STUDENTS_PAGE.fetch(conn, after, limit, filters, columns)
 
 async def get_student(conn: Connection, student_id: str):
-    return await fetch_one(conn, "SELECT * FROM get_student($1);", student_id)
+    return await GET_STUDENT.fetchrow(conn, student_id)
 
 async def add_student(conn: Connection, student: Student):
-    await call_proc(
+    await INSERT_STUDENT.execute(
         conn,
-        "insert_student($1, $2, $3, $4, $5)",
         student.name,
         student.sex,
         student.entranceAge,
@@ -20,9 +30,8 @@ async def add_student(conn: Connection, student: Student):
     )
 
 async def update_student(conn: Connection, student_id: str, student: Student):
-    await call_proc(
+    await UPDATE_STUDENT.execute(
         conn,
-        "update_student($1, $2, $3, $4, $5, $6)",
         student_id,
         student.name,
         student.sex,
@@ -32,18 +41,17 @@ async def update_student(conn: Connection, student_id: str, student: Student):
     )
 
 async def delete_student(conn: Connection, student_id: str):
-    await call_proc(conn, "delete_student($1)", student_id)
+    await DELETE_STUDENT.execute(conn, student_id)
 
-async def get_student_courses(conn: Connection, student_id: str):
-    return await fetch_all(conn, "SELECT * FROM get_student_courses($1);", student_id)
+async def get_student_info(conn: Connection, student_id: str, columns: tuple[str, ...] = None):
+    query = projected(GET_STUDENT_INFO, columns) if columns else GET_STUDENT_INFO
+    return await query.fetchrow(conn, student_id)
 
-async def update_student_courses(conn: Connection, student_id: str, course_ids: list[str]):
-    for course_id in course_ids:
-        await call_proc(conn, "insert_course_choosing_if_not_exists($1, $2)", student_id, course_id)
+async def get_student_courses(conn: Connection, student_id: str):
+    return await GET_STUDENT_COURSES.fetch(conn, student_id)
 
-async def delete_student_courses(conn: Connection, student_id: str, course_ids: list[str]):
-    for course_id in course_ids:
-        await call_proc(conn, "delete_course_choosing($1, $2)", student_id, course_id)
+async def set_student_courses(conn: Connection, student_id: str, course_ids: list[str]):
+    await SET_STUDENT_COURSES.execute(conn, student_id, course_ids)
 
 async def update_student_course_score(conn: Connection, student_id: str, course_id: str, score: float):
-    await call_proc(conn, "update_student_course_score($1, $2, $3)", student_id, course_id, score)
\ No newline at end of file
+    await UPDATE_STUDENT_COURSE_SCORE.execute(conn, student_id, course_id, score)
@@ -1,27 +1,44 @@
 from asyncpg import Connection
 from models.schemas import Teacher
-from .base import fetch_one, call_proc, fetch_all
-
-async def get_teachers(conn: Connection):
-    return await fetch_all(conn, "SELECT * FROM get_teachers();")
+from .queries import call, page, select
+
+TEACHERS_PAGE = page("teachers_page", "teachers", "teacher_id")
+GET_TEACHER = select("get_teacher", "SELECT * FROM get_teacher($1)", single_row=True)
+GET_COURSES_BY_TEACHER = select("get_courses_by_teacher", "SELECT * FROM get_courses_by_teacher($1)")
+INSERT_TEACHER = select("insert_teacher", "SELECT insert_teacher($1)")
+TEACHES_COURSE = select("teaches_course", "SELECT * FROM teaches_course($1, $2)")
+INSERT_COURSE_TEACHER = call("insert_course_teacher", "insert_course_teacher($1, $2)")
+DELETE_COURSE_TEACHER = call("delete_course_teacher", "delete_course_teacher($1, $2)")
+SET_TEACHER_COURSES = call("set_teacher_courses", "set_teacher_courses($1, $2)")
+DELETE_TEACHER = call("delete_teacher", "delete_teacher($1)")
+UPDATE_TEACHER = call("update_teacher", "update_teacher($1, $2)")
+
+async def get_teachers(conn: Connection, after: str = None, limit: int = None):
+    return await TEACHERS_PAGE.fetch(conn, after, limit)
 
 async def get_teacher(conn: Connection, teacher_id: str):
-    return await fetch_one(conn, "SELECT * FROM get_teacher($1);", teacher_id)
+    return await GET_TEACHER.fetchrow(conn, teacher_id)
 
 async def add_course_teacher(conn: Connection, course_id: str, teacher_id: str):
-    await call_proc(conn, "insert_course_teacher($1, $2)", course_id, teacher_id)
+    await INSERT_COURSE_TEACHER.execute(conn, course_id, teacher_id)
 
 async def delete_course_teacher(conn: Connection, course_id: str, teacher_id: str):
-    await call_proc(conn, "delete_course_teacher($1, $2)", course_id, teacher_id)
+    await DELETE_COURSE_TEACHER.execute(conn, course_id, teacher_id)
+
+async def set_teacher_courses(conn: Connection, teacher_id: str, course_ids: set[str]):
+    await SET_TEACHER_COURSES.execute(conn, teacher_id, list(course_ids))
 
-async def add_teacher(conn: Connection, teacher: Teacher):
-    return await fetch_one(conn, "SELECT * FROM insert_teacher($1);", teacher.name)
+async def add_teacher(conn: Connection, teacher: Teacher) -> str:
+    return await INSERT_TEACHER.fetchval(conn, teacher.name)
 
 async def delete_teacher(conn: Connection, teacher_id: str):
-    await call_proc(conn, "delete_teacher($1)", teacher_id)
+    await DELETE_TEACHER.execute(conn, teacher_id)
 
 async def update_teacher(conn: Connection, teacher_id: str, teacher: Teacher):
-    await call_proc(conn, "update_teacher($1, $2)", teacher_id, teacher.name)
+    await UPDATE_TEACHER.execute(conn, teacher_id, teacher.name)
+
+async def teaches_course(conn: Connection, teacher_id: str, course_id: str) -> bool:
+    return bool(await TEACHES_COURSE.fetchval(conn, teacher_id, course_id))
 
 async def get_teacher_courses(conn: Connection, teacher_id: str):
-    return await fetch_all(conn, "SELECT * FROM get_courses_by_teacher($1);", teacher_id)
\ No newline at end of file
+    return await GET_COURSES_BY_TEACHER.fetch(conn, teacher_id)
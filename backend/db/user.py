@@ -1,11 +1,25 @@
 from asyncpg import Connection
-from .base import call_proc, fetch_one
+from .queries import call, select
 from models.schemas import User
 
+INSERT_USER = call("insert_user", "insert_user($1, $2, $3, $4, $5)")
+UPDATE_USER_PASSWORD = call("update_user_password", "update_user_password($1, $2)")
+GET_USER = select("get_user", "SELECT * FROM get_user($1)", single_row=True)
+# The person row is locked so two registrations cannot claim it at once;
+# username is set when an account already belongs to it.
+CLAIM_STUDENT = select(
+    "claim_student",
+    "SELECT s.student_id, u.username FROM students s LEFT JOIN users u ON u.student_id = s.student_id WHERE s.student_id = $1 FOR UPDATE OF s"
+)
+CLAIM_TEACHER = select(
+    "claim_teacher",
+    "SELECT t.teacher_id, u.username FROM teachers t LEFT JOIN users u ON u.teacher_id = t.teacher_id WHERE t.teacher_id = $1 FOR UPDATE OF t"
+)
+GET_ADMIN_USERS = select("get_admin_users", "SELECT * FROM get_admin_users()", single_row=True)
+
 async def add_user(conn: Connection, user: User):
-    await call_proc(
+    await INSERT_USER.execute(
         conn,
-        "insert_user($1, $2, $3, $4, $5)",
         user.username,
         user.password,
         user.role,
@@ -13,8 +27,17 @@ async def add_user(conn: Connection, user: User):
         user.teacher_id
     )
 
+async def update_user_password(conn: Connection, username: str, password_hash: str):
+    await UPDATE_USER_PASSWORD.execute(conn, username, password_hash)
+
 async def get_user(conn: Connection, username: str):
-    return await conn.fetchrow("SELECT * FROM get_user($1);", username)
+    return await GET_USER.fetchrow(conn, username)
 
 async def get_admin_users(conn: Connection):
-    return await fetch_one(conn, "SELECT * FROM get_admin_users()")
\ No newline at end of file
+    return await GET_ADMIN_USERS.fetchrow(conn)
+
+async def claim_student(conn: Connection, student_id: str):
+    return await CLAIM_STUDENT.fetch(conn, student_id)
+
+async def claim_teacher(conn: Connection, teacher_id: str):
+    return await CLAIM_TEACHER.fetch(conn, teacher_id)
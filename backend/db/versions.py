@@ -0,0 +1,21 @@
+from asyncpg import Connection
+from .queries import select
+
+GET_TABLE_VERSIONS = select("get_table_versions", "SELECT * FROM get_table_versions($1)")
+
+# The tables each cached read depends on; a write to any of them changes its ETag.
+STUDENT_TABLES = ("students",)
+STUDENT_INFO_TABLES = ("students", "course_choosing", "courses")
+CHOSEN_COURSE_TABLES = ("course_choosing", "courses")
+COURSE_TABLES = ("courses",)
+COURSE_INFO_TABLES = ("courses", "course_choosing", "students")
+COURSE_STUDENT_TABLES = ("course_choosing", "students")
+TEACHER_TABLES = ("teachers",)
+TEACHER_COURSE_TABLES = ("course_teacher", "courses")
+TEACHER_DETAIL_TABLES = ("teachers", "course_teacher", "courses")
+CLASS_TABLES = ("students", "course_choosing")
+STATISTICS_TABLES = ("students", "teachers", "courses", "course_choosing")
+
+async def get_table_versions(conn: Connection, tables: tuple[str, ...]) -> dict[str, int]:
+    rows = await GET_TABLE_VERSIONS.fetch(conn, list(tables))
+    return {row["table_name"]: row["version"] for row in rows}
@@ -1,33 +1,54 @@
 from asyncpg import Connection
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from auth import AuthService
+from fastapi.responses import JSONResponse, PlainTextResponse
+from auth import auth_service, get_current_user, require_admin
+from config import settings
 from db.user import add_user, get_admin_users
 from models.schemas import Statistics, User
-from routes import classes, courses, students, teachers, user
-from db.database import db, get_statistic
+from routes import classes, courses, events, export, imports, internal, search, students, teachers, user
+from db.database import PoolTimeoutError, db, get_statistic
+from db.listener import listener
+from db.migrate import migrate
+from db.routing import ReadRoutingMiddleware
+from db.versions import STATISTICS_TABLES, get_table_versions
+from utils.admission import AdmissionMiddleware
+from utils.compression import CompressionMiddleware
+from utils.etag import ETAG_HEADER, not_modified
+from utils.metrics import MetricsMiddleware, metrics
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.serialization import TimedJSONResponse
 from contextlib import asynccontextmanager
 
-auth_service = AuthService(config_path="config.json", db=db)
-
 async def check_if_admin_exist(conn: Connection):
     admin = await get_admin_users(conn)
     if not admin:
        await add_user(conn, User(
             username="admin",
-            password=auth_service.hash_password("admin"),
+            password=await auth_service.hash_password("admin"),
             role="admin"
         ))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db.connect()
-    async with db.pool.acquire() as conn:
+    async with db.acquire() as conn:
+        await migrate(conn)
         await check_if_admin_exist(conn)
+    if db.config.warm_up:
+        await db.warm_up()
+    await listener.start()
     yield
+    await listener.stop()
     await db.disconnect()
+    auth_service.hasher.close()
+
+app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
 
-app = FastAPI(lifespan=lifespan)
+# Innermost, so a 503 from admission control still gets CORS headers and is
+# counted by MetricsMiddleware.
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 origins = [
     "*"
@@ -39,18 +60,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, "Retry-After"],
 )
+app.add_middleware(ReadRoutingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout(request: Request, exc: PoolTimeoutError):
+    # No connection freed up in time: the server is saturated, not broken.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(settings.admission.retry_after)},
+    )
 
-app.include_router(students.router, prefix="/students")
-app.include_router(courses.router, prefix="/courses")
-app.include_router(teachers.router, prefix="/teachers")
-app.include_router(classes.router, prefix="/class")
+authenticated = [Depends(get_current_user)]
+admin_only = [Depends(require_admin)]
+
+app.include_router(students.router, prefix="/students", dependencies=authenticated)
+app.include_router(courses.router, prefix="/courses", dependencies=authenticated)
+app.include_router(teachers.router, prefix="/teachers", dependencies=authenticated)
+app.include_router(classes.router, prefix="/class", dependencies=authenticated)
+app.include_router(search.router, prefix="/search", dependencies=authenticated)
 app.include_router(user.router, prefix="/auth")
+app.include_router(events.router, prefix="/events", dependencies=authenticated)
+app.include_router(export.router, prefix="/export", dependencies=admin_only)
+app.include_router(imports.router, prefix="/import", dependencies=admin_only)
+app.include_router(internal.router, prefix="/internal", dependencies=admin_only)
 
 @app.get("/statistics", response_model=Statistics)
-async def get():
+async def get(request: Request, response: Response):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, STATISTICS_TABLES))
+            if unchanged:
+                return unchanged
             statistic = await get_statistic(conn)
             return Statistics(
                 totalStudents=statistic["total_students"],
@@ -59,5 +103,11 @@ async def get():
                 totalClasses=statistic["total_classes"],
                 averageScore=statistic["average_score"]
             )
+    except PoolTimeoutError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
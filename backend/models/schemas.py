@@ -30,6 +30,8 @@ class StudentInfo(BaseModel):
     entranceYear: int
     studentClass: str
     averageScore: float
+    weightedAverageScore: float
+    courseCount: int
     courses: Optional[list[ChosenCourse]]
 
 class Course(BaseModel):
@@ -54,6 +56,8 @@ class CourseInfo(BaseModel):
     grade: float
     canceledYear: Optional[int]
     averageScore: float
+    studentCount: int
+    students: list[StudentWithScore]
 
 class CourseChoosing(BaseModel):
     studentId: str
@@ -64,10 +68,33 @@ class CourseChoosing(BaseModel):
 class CourseChoosingResponse(BaseModel):
     courseChoosing: list[CourseChoosing]
 
-class ClassInfo(BaseModel):
+class ScoreUpdate(BaseModel):
+    studentId: str
+    score: float
+    # Sent only to make the row conditional: it is applied only if the stored
+    # score still equals this value (null for a not yet graded enrollment).
+    previousScore: Optional[float] = None
+
+class ScoreResult(BaseModel):
+    studentId: str
+    status: str
+    score: Optional[float]
+
+class ScoreReport(BaseModel):
+    total: int
+    updated: int
+    results: list[ScoreResult]
+
+class ClassSummary(BaseModel):
     className: str
+    studentCount: int
+    averageScore: Optional[float]
+    minScore: Optional[float]
+    maxScore: Optional[float]
+    enrollmentCount: int
+
+class ClassInfo(ClassSummary):
     students: list[Student]
-    averageScore: float
 
 class User(BaseModel):
     username: str
@@ -95,7 +122,36 @@ class Statistics(BaseModel):
     totalClasses: int
     averageScore: float
 
+class StatisticsDrift(BaseModel):
+    metric: str
+    maintained: float
+    actual: float
+
 class TeacherDetails(BaseModel):
     id: str
     name: str
-    courses: list[Course]
\ No newline at end of file
+    courses: list[Course]
+
+class SearchHit(BaseModel):
+    id: str
+    name: str
+    similarity: float
+
+class SearchResults(BaseModel):
+    students: list[SearchHit]
+    teachers: list[SearchHit]
+    courses: list[SearchHit]
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportedRow(BaseModel):
+    row: int
+    id: str
+
+class ImportReport(BaseModel):
+    total: int
+    imported: int
+    errors: list[ImportRowError]
+    ids: list[ImportedRow]
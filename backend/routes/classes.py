@@ -1,13 +1,62 @@
-from fastapi import APIRouter, HTTPException
-from db.classes import get_students_average_score_by_class
-from db.database import db
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from db.classes import get_class_summaries, get_class_summary, get_students_average_score_by_class
+from db.database import PoolTimeoutError, db
+from db.students import get_students
+from db.versions import CLASS_TABLES, get_table_versions
+from models.schemas import ClassInfo, ClassSummary
+from utils.classes import prepare_class_info, prepare_class_summaries
+from utils.etag import not_modified
+from utils.pagination import MAX_PAGE_SIZE, set_next_cursor
 
 router = APIRouter()
 
+@router.get("", response_model=list[ClassSummary])
+async def get_all(request: Request, response: Response):
+    try:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, CLASS_TABLES))
+            if unchanged:
+                return unchanged
+            summaries = await get_class_summaries(conn)
+            return prepare_class_summaries(summaries)
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{class_name}", response_model=float)
-async def get_class_average_score(class_name: str):
+async def get_class_average_score(class_name: str, request: Request, response: Response):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, CLASS_TABLES))
+            if unchanged:
+                return unchanged
             return await get_students_average_score_by_class(conn, class_name)
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{class_name}/details", response_model=ClassInfo)
+async def get_details(
+    class_name: str,
+    request: Request,
+    response: Response,
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    try:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, CLASS_TABLES))
+            if unchanged:
+                return unchanged
+            summary = await get_class_summary(conn, class_name)
+            if not summary:
+                raise HTTPException(status_code=404, detail="Class not found")
+            students = await get_students(conn, after, limit, class_name)
+            set_next_cursor(response, students, limit, "student_id")
+            return prepare_class_info(summary, students)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
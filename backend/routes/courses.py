@@ -1,66 +1,142 @@
-from fastapi import APIRouter, HTTPException
-from db.courses import add_course, delete_course, get_course, get_course_students, get_courses, update_course
-from db.database import db
-from models.schemas import Course, CourseInfo, StudentWithScore
-from utils.courses import prepare_course, prepare_courses, prepare_student_by_course
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from auth import get_current_user, require_admin, require_roles
+from config import settings
+from db.catalog import cached_courses, cached_table_versions, catalog_cache
+from db.courses import add_course, delete_course, get_course, get_course_info, get_course_students, set_course_scores, update_course
+from db.database import PoolTimeoutError, db
+from db.teachers import teaches_course
+from db.versions import COURSE_INFO_TABLES, COURSE_STUDENT_TABLES, COURSE_TABLES, get_table_versions
+from models.schemas import Course, CourseInfo, ScoreReport, ScoreUpdate, StudentWithScore, UserOut
+from utils.etag import not_modified
+from utils.courses import prepare_course, prepare_courses, prepare_score_report, prepare_student_by_course
+from utils.pagination import MAX_PAGE_SIZE, set_next_cursor
+from utils.fields import parse_fields
+from utils.serialization import COURSE_INFO_MAPPER, COURSE_MAPPER, STUDENT_WITH_SCORE_MAPPER, record_response, records_response
 
 router = APIRouter()
 
 @router.get("", response_model=list[Course])
-async def get_all():
+async def get_all(
+    request: Request,
+    response: Response,
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    canceled_year: int | None = None
+):
     try:
-        async with db.pool.acquire() as conn:
-            courses = await get_courses(conn)
-            return prepare_courses(courses)
+        unchanged = not_modified(request, response, await cached_table_versions(COURSE_TABLES))
+        if unchanged:
+            return unchanged
+        courses = await cached_courses(after, limit, canceled_year)
+        set_next_cursor(response, courses, limit, "course_id")
+        if settings.api.fast_json:
+            return records_response(courses, COURSE_MAPPER, response)
+        return prepare_courses(courses)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/new")
+@router.get("/new", dependencies=[Depends(require_admin)])
 async def create(course: Course):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire(primary=True) as conn:
             await add_course(conn, course)
+        catalog_cache.invalidate("courses")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{course_id}", response_model=CourseInfo)
-async def get(course_id: str):
+async def get(course_id: str, request: Request, response: Response, fields: str | None = None, user: UserOut = Depends(get_current_user)):
+    projection = parse_fields(fields, COURSE_INFO_MAPPER)
+    if user.role == "student":
+        # The embedded roster carries every enrolled student's score, which only
+        # admins and teachers may read (as with /courses/{id}/students).
+        projection = tuple(field for field in projection or COURSE_INFO_MAPPER.field_names() if field != "students")
     try:
-        async with db.pool.acquire() as conn:
-            course = await get_course(conn, course_id)
-            studentsGrades = await get_course_students(conn, course_id)
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, COURSE_INFO_TABLES), ",".join(projection or ()))
+            if unchanged:
+                return unchanged
+            columns = COURSE_INFO_MAPPER.columns_for(projection) if projection else None
+            course = await get_course_info(conn, course_id, columns)
             if not course:
                 raise HTTPException(status_code=404, detail="Course not found")
-            return prepare_course(course, studentsGrades)
+            if projection:
+                return record_response(course, COURSE_INFO_MAPPER.only(projection), response)
+            return prepare_course(course)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{course_id}")
+@router.delete("/{course_id}", dependencies=[Depends(require_admin)])
 async def delete(course_id: str):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             await delete_course(conn, course_id)
+        catalog_cache.invalidate("courses", "course_teacher", "course_choosing")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/{course_id}")
+@router.put("/{course_id}", dependencies=[Depends(require_admin)])
 async def update(course_id: str, course: Course):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             async with conn.transaction():
                 existing_course = await get_course(conn, course_id)
                 if not existing_course:
                     raise HTTPException(status_code=404, detail="Course not found")
                 await update_course(conn, course_id, course)
+        catalog_cache.invalidate("courses")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{course_id}/students", response_model=list[StudentWithScore])
-async def get_students(course_id: str):
+@router.get("/{course_id}/students", response_model=list[StudentWithScore], dependencies=[Depends(require_roles("admin", "teacher"))])
+async def get_students(course_id: str, request: Request, response: Response, fields: str | None = None):
+    projection = parse_fields(fields, STUDENT_WITH_SCORE_MAPPER)
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, COURSE_STUDENT_TABLES))
+            if unchanged:
+                return unchanged
+            if projection:
+                students = await get_course_students(conn, course_id, STUDENT_WITH_SCORE_MAPPER.columns_for(projection))
+                return records_response(students, STUDENT_WITH_SCORE_MAPPER.only(projection), response)
             students = await get_course_students(conn, course_id)
+            if settings.api.fast_json:
+                return records_response(students, STUDENT_WITH_SCORE_MAPPER, response)
             return prepare_student_by_course(students)
                         
+    except PoolTimeoutError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/{course_id}/scores", response_model=ScoreReport)
+async def update_scores(
+    course_id: str,
+    scores: list[ScoreUpdate],
+    user: UserOut = Depends(require_roles("admin", "teacher"))
+):
+    student_ids = [entry.studentId for entry in scores]
+    if len(set(student_ids)) != len(student_ids):
+        raise HTTPException(status_code=400, detail="Each student can only be listed once")
+    try:
+        async with db.acquire() as conn:
+            if user.role == "teacher" and not await teaches_course(conn, user.teacher_id, course_id):
+                raise HTTPException(status_code=403, detail="Teachers can only grade their own courses")
+            if not await get_course(conn, course_id):
+                raise HTTPException(status_code=404, detail="Course not found")
+            rows = await set_course_scores(conn, course_id, scores)
+            return prepare_score_report(rows)
+    except (HTTPException, PoolTimeoutError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,42 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from auth import ensure_student_access, get_current_user
+from db.events import RESYNC, Subscription, TooManySubscribers, event_hub
+from models.schemas import UserOut
+
+# Tells EventSource how long to wait before reconnecting after the stream drops.
+RETRY_MS = 3000
+
+router = APIRouter()
+
+def format_event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+async def event_stream(subscription: Subscription):
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            event = await subscription.next(event_hub.config.keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+            elif event is RESYNC:
+                yield format_event("resync", {})
+            else:
+                yield format_event("enrollment", event)
+    finally:
+        event_hub.unsubscribe(subscription)
+
+@router.get("")
+async def stream(course_id: str | None = None, student_id: str | None = None, user: UserOut = Depends(get_current_user)):
+    if user.role == "student":
+        ensure_student_access(user, student_id)
+    try:
+        subscription = event_hub.subscribe(course_id, student_id)
+    except TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return StreamingResponse(
+        event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,70 @@
+from contextlib import AsyncExitStack
+from typing import Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from db.database import db
+from db.export import COURSE_CHOOSING_COLUMNS, COURSE_COLUMNS, STUDENT_COLUMNS, export_course_choosing, export_courses, export_students
+from utils.export import MEDIA_TYPES, format_chunks
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+async def stream_export(name: str, fmt: str, columns: list[str], export, *args):
+    # The connection is taken and the first row fetched before the response
+    # starts, so pool exhaustion or a failing query is still a 503/500 rather
+    # than a 200 with a truncated body. The body releases the connection when
+    # done; the background task covers a client that leaves early.
+    stack = AsyncExitStack()
+    try:
+        conn = await stack.enter_async_context(db.acquire())
+        await stack.enter_async_context(conn.transaction(isolation="repeatable_read", readonly=True))
+        records = export(conn, *args)
+        first = await anext(records, None)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def rows():
+        if first is None:
+            return
+        yield first
+        async for record in records:
+            yield record
+
+    async def generate():
+        try:
+            async for chunk in format_chunks(fmt, rows(), columns):
+                yield chunk
+        finally:
+            await stack.aclose()
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+        background=BackgroundTask(stack.aclose)
+    )
+
+@router.get("/students")
+async def students(
+    format: ExportFormat = "ndjson",
+    student_class: str | None = Query(None, alias="class"),
+    entrance_year: int | None = None,
+    sex: str | None = None
+):
+    return await stream_export("students", format, STUDENT_COLUMNS, export_students, student_class, entrance_year, sex)
+
+@router.get("/courses")
+async def courses(format: ExportFormat = "ndjson", canceled_year: int | None = None):
+    return await stream_export("courses", format, COURSE_COLUMNS, export_courses, canceled_year)
+
+@router.get("/course-choosing")
+async def course_choosing(
+    format: ExportFormat = "ndjson",
+    student_id: str | None = None,
+    course_id: str | None = None,
+    chosen_year: int | None = None
+):
+    return await stream_export("course_choosing", format, COURSE_CHOOSING_COLUMNS, export_course_choosing, student_id, course_id, chosen_year)
@@ -0,0 +1,40 @@
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Request
+from db.catalog import catalog_cache
+from db.database import PoolTimeoutError, db
+from db.imports import COURSE_CHOOSING_IMPORT_COLUMNS, COURSE_IMPORT_COLUMNS, STUDENT_IMPORT_COLUMNS, import_course_choosing, import_courses, import_students
+from models.schemas import ImportReport
+from utils.imports import parse_records, prepare_import_report
+
+router = APIRouter()
+
+ImportFormat = Literal["csv", "ndjson"]
+
+async def run_import(request: Request, fmt: str, columns: list[str], importer):
+    try:
+        content = (await request.body()).decode("utf-8-sig")
+        records = parse_records(content, fmt, columns)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        async with db.acquire() as conn:
+            rows = await importer(conn, records)
+            return prepare_import_report(rows)
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/students", response_model=ImportReport)
+async def students(request: Request, format: ImportFormat = "csv"):
+    return await run_import(request, format, STUDENT_IMPORT_COLUMNS, import_students)
+
+@router.post("/courses", response_model=ImportReport)
+async def courses(request: Request, format: ImportFormat = "csv"):
+    report = await run_import(request, format, COURSE_IMPORT_COLUMNS, import_courses)
+    catalog_cache.invalidate("courses")
+    return report
+
+@router.post("/course-choosing", response_model=ImportReport)
+async def course_choosing(request: Request, format: ImportFormat = "csv"):
+    return await run_import(request, format, COURSE_CHOOSING_IMPORT_COLUMNS, import_course_choosing)
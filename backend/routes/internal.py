@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException
+from auth import auth_service
+from db.catalog import catalog_cache
+from db.database import PoolTimeoutError, check_statistics, db
+from db.events import event_hub
+from db.slow_queries import slow_query_log
+from models.schemas import StatisticsDrift
+from utils.admission import admission
+
+router = APIRouter()
+
+@router.get("/statistics/drift", response_model=list[StatisticsDrift])
+async def statistics_drift():
+    try:
+        async with db.acquire() as conn:
+            drift = await check_statistics(conn)
+            return [StatisticsDrift(metric=row["metric"], maintained=row["maintained"], actual=row["actual"]) for row in drift]
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/hashing")
+async def hashing():
+    return auth_service.hasher.stats()
+
+@router.get("/pool")
+async def pool():
+    return db.stats()
+
+@router.get("/slow-queries")
+async def slow_queries():
+    return slow_query_log.stats()
+
+@router.delete("/slow-queries")
+async def clear_slow_queries():
+    slow_query_log.clear()
+
+@router.get("/cache")
+async def cache():
+    return {
+        "catalog": catalog_cache.stats(),
+        "tokens": auth_service.token_cache.stats(),
+        "users": auth_service.user_cache.stats(),
+    }
+
+@router.get("/events")
+async def events():
+    return event_hub.stats()
+
+@router.get("/admission")
+async def admission_stats():
+    return admission.stats()
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Query
+from db.database import PoolTimeoutError, db
+from db.search import ID_PATTERN, search_ids, search_names
+from models.schemas import SearchResults
+from utils.search import prepare_search_results
+
+MAX_SEARCH_LIMIT = 50
+SEARCH_TYPES = {"students": "student", "teachers": "teacher", "courses": "course"}
+
+router = APIRouter()
+
+def parse_types(types: str | None) -> list[str]:
+    if not types:
+        return list(SEARCH_TYPES.values())
+    names = [name.strip() for name in types.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+    return [SEARCH_TYPES[name] for name in names]
+
+@router.get("", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    types: str | None = None,
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_LIMIT)
+):
+    kinds = parse_types(types)
+    query = q.strip()
+    try:
+        async with db.acquire() as conn:
+            if ID_PATTERN.match(query.upper()):
+                rows = [row for row in await search_ids(conn, query.upper()) if row["kind"] in kinds]
+            else:
+                rows = await search_names(conn, query, kinds, limit)
+            return prepare_search_results(rows)
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,88 +1,145 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from auth import auth_service, ensure_student_access, get_current_user, require_admin, require_roles
+from config import settings
 from utils.courses import prepare_chosen_courses
-from db.students import add_student, delete_student, delete_student_courses, get_student, get_student_courses, get_students, update_student, update_student_course_score, update_student_courses
-from models.schemas import ChosenCourse, Course, Student, StudentInfo
-from db.database import db
+from db.teachers import teaches_course
+from db.students import add_student, delete_student, get_student, get_student_courses, get_student_info, get_students, set_student_courses, update_student, update_student_course_score
+from models.schemas import ChosenCourse, Course, Student, StudentInfo, UserOut
+from db.database import PoolTimeoutError, db
+from db.versions import CHOSEN_COURSE_TABLES, STUDENT_INFO_TABLES, STUDENT_TABLES, get_table_versions
+from utils.etag import not_modified
+from utils.pagination import MAX_PAGE_SIZE, set_next_cursor
+from utils.fields import parse_fields
+from utils.serialization import STUDENT_INFO_MAPPER, STUDENT_MAPPER, record_response, records_response
 from utils.students import prepare_student, prepare_students
 
 router = APIRouter()
 
 @router.get("", response_model=list[Student])
-async def get_all():
+async def get_all(
+    request: Request,
+    response: Response,
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    student_class: str | None = Query(None, alias="class"),
+    entrance_year: int | None = None,
+    sex: str | None = None,
+    fields: str | None = None
+):
+    projection = parse_fields(fields, STUDENT_MAPPER)
     try:
-        async with db.pool.acquire() as conn:
-            students = await get_students(conn)
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, STUDENT_TABLES))
+            if unchanged:
+                return unchanged
+            if projection:
+                students = await get_students(conn, after, limit, student_class, entrance_year, sex, STUDENT_MAPPER.columns_for(projection))
+                set_next_cursor(response, students, limit, "student_id")
+                return records_response(students, STUDENT_MAPPER.only(projection), response)
+            students = await get_students(conn, after, limit, student_class, entrance_year, sex)
+            set_next_cursor(response, students, limit, "student_id")
+            if settings.api.fast_json:
+                return records_response(students, STUDENT_MAPPER, response)
             return prepare_students(students)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{student_id}", response_model=StudentInfo)
-async def get(student_id: str):
+async def get(student_id: str, request: Request, response: Response, fields: str | None = None, user: UserOut = Depends(get_current_user)):
+    ensure_student_access(user, student_id)
+    projection = parse_fields(fields, STUDENT_INFO_MAPPER)
     try:
-        async with db.pool.acquire() as conn:
-            async with conn.transaction():
-                student = await get_student(conn, student_id)
-                courses = await get_student_courses(conn, student_id)
-                if not student:
-                    raise HTTPException(status_code=404, detail="Student not found")
-                return prepare_student(student, courses)
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, STUDENT_INFO_TABLES))
+            if unchanged:
+                return unchanged
+            columns = STUDENT_INFO_MAPPER.columns_for(projection) if projection else None
+            student = await get_student_info(conn, student_id, columns)
+            if not student:
+                raise HTTPException(status_code=404, detail="Student not found")
+            if projection:
+                return record_response(student, STUDENT_INFO_MAPPER.only(projection), response)
+            return prepare_student(student)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/new")
+@router.post("/new", dependencies=[Depends(require_admin)])
 async def create(student: Student):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             await add_student(conn, student)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{student_id}")
+@router.delete("/{student_id}", dependencies=[Depends(require_admin)])
 async def delete(student_id: str):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             await delete_student(conn, student_id)
+        auth_service.invalidate_user()
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/{student_id}")
+@router.put("/{student_id}", dependencies=[Depends(require_admin)])
 async def update(student_id: str, student: Student):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             async with conn.transaction():
                 existing_student = await get_student(conn, student_id)
                 if not existing_student:
                     raise HTTPException(status_code=404, detail="Student not found")
                 await update_student(conn, student_id, student)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/course-choice/{student_id}", response_model=list[ChosenCourse])
-async def get_course_choice(student_id: str):
+async def get_course_choice(student_id: str, request: Request, response: Response, user: UserOut = Depends(get_current_user)):
+    ensure_student_access(user, student_id)
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
+            unchanged = not_modified(request, response, await get_table_versions(conn, CHOSEN_COURSE_TABLES))
+            if unchanged:
+                return unchanged
             courses = await get_student_courses(conn, student_id)
             return prepare_chosen_courses(courses)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/course-choice/{student_id}")
+@router.put("/course-choice/{student_id}", dependencies=[Depends(require_admin)])
 async def update_course_choice(student_id: str, courses_ids: list[str]):
     try:
-        async with db.pool.acquire() as conn:
-            async with conn.transaction():
-                student_courses = await get_student_courses(conn, student_id)
-                for course in student_courses:
-                    if course['id'] not in courses_ids:
-                        await delete_student_courses(conn, student_id, [course['id']])
-                await update_student_courses(conn, student_id, courses_ids)
+        async with db.acquire() as conn:
+            await set_student_courses(conn, student_id, courses_ids)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/course-choice/{student_id}/{course_id}/{score}")
-async def update_course_choice(student_id: str, course_id: str, score: float):
+async def update_course_choice(
+    student_id: str,
+    course_id: str,
+    score: float,
+    user: UserOut = Depends(require_roles("admin", "teacher"))
+):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
+            if user.role == "teacher" and not await teaches_course(conn, user.teacher_id, course_id):
+                raise HTTPException(status_code=403, detail="Teachers can only grade their own courses")
             await update_student_course_score(conn, student_id, course_id, score)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
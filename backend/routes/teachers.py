@@ -1,77 +1,112 @@
-from fastapi import APIRouter, HTTPException
-from db.database import db
-from db.teachers import add_course_teacher, add_teacher, delete_course_teacher, delete_teacher, get_teacher, get_teacher_courses, get_teachers, update_teacher
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from auth import auth_service, require_admin
+from config import settings
+from db.database import PoolTimeoutError, db
+from db.versions import TEACHER_COURSE_TABLES, TEACHER_DETAIL_TABLES, TEACHER_TABLES
+from db.catalog import cached_table_versions, cached_teacher_courses, cached_teacher_details, cached_teachers, catalog_cache
+from db.teachers import add_teacher, delete_teacher, set_teacher_courses, update_teacher
 from models.schemas import Course, Teacher, TeacherDetails
-from utils.teachers import prepare_teacher_courses, prepare_teacher_details, prepare_teachers
+from utils.etag import not_modified
+from utils.pagination import MAX_PAGE_SIZE, set_next_cursor
+from utils.fields import parse_fields
+from utils.serialization import TEACHER_MAPPER, records_response
+from utils.teachers import prepare_teacher_courses, prepare_teacher_details, prepare_teachers, teacher_course_ids
 
 router = APIRouter()
 
 @router.get("", response_model=list[Teacher])
-async def get_all():
+async def get_all(
+    request: Request,
+    response: Response,
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None
+):
+    # teachers has no columns beyond id and name, so ?fields= only trims the
+    # response; there is nothing to leave out of the SELECT.
+    projection = parse_fields(fields, TEACHER_MAPPER)
     try:
-        async with db.pool.acquire() as conn:
-            teachers = await get_teachers(conn)
-            return prepare_teachers(teachers)
+        unchanged = not_modified(request, response, await cached_table_versions(TEACHER_TABLES))
+        if unchanged:
+            return unchanged
+        teachers = await cached_teachers(after, limit)
+        set_next_cursor(response, teachers, limit, "teacher_id")
+        if projection:
+            return records_response(teachers, TEACHER_MAPPER.only(projection), response)
+        if settings.api.fast_json:
+            return records_response(teachers, TEACHER_MAPPER, response)
+        return prepare_teachers(teachers)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{teacher_id}", response_model=list[Course])
-async def get(teacher_id: str):
+async def get(teacher_id: str, request: Request, response: Response):
     try:
-        async with db.pool.acquire() as conn:
-            courses = await get_teacher_courses(conn, teacher_id)
-            if not courses:
-                courses = []
-            return prepare_teacher_courses(courses)
+        unchanged = not_modified(request, response, await cached_table_versions(TEACHER_COURSE_TABLES))
+        if unchanged:
+            return unchanged
+        courses = await cached_teacher_courses(teacher_id)
+        if not courses:
+            courses = []
+        return prepare_teacher_courses(courses)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/details/{teacher_id}", response_model=TeacherDetails)
-async def get_details(teacher_id: str):
+async def get_details(teacher_id: str, request: Request, response: Response):
     try:
-        async with db.pool.acquire() as conn:
-            async with conn.transaction():
-                teacher = await get_teacher(conn, teacher_id)
-                courses = await get_teacher_courses(conn, teacher_id)
-                if not courses:
-                    courses = []
-                courses = prepare_teacher_courses(courses)
-                return prepare_teacher_details(teacher, courses)
+        unchanged = not_modified(request, response, await cached_table_versions(TEACHER_DETAIL_TABLES))
+        if unchanged:
+            return unchanged
+        teacher, courses = await cached_teacher_details(teacher_id)
+        if not courses:
+            courses = []
+        courses = prepare_teacher_courses(courses)
+        return prepare_teacher_details(teacher, courses)
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/new")
+@router.post("/new", dependencies=[Depends(require_admin)])
 async def create(teacher: Teacher):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             async with conn.transaction():
                 teacher_id = await add_teacher(conn, teacher)
-                for course in teacher.courses:
-                    await add_course_teacher(conn, course.id, teacher_id['insert_teacher'])
+                await set_teacher_courses(conn, teacher_id, teacher_course_ids(teacher))
+        catalog_cache.invalidate("teachers", "course_teacher")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@router.delete("/{teacher_id}")
+@router.delete("/{teacher_id}", dependencies=[Depends(require_admin)])
 async def delete(teacher_id: str):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             await delete_teacher(conn, teacher_id)
+        catalog_cache.invalidate("teachers", "course_teacher")
+        auth_service.invalidate_user()
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/{teacher_id}")
+@router.put("/{teacher_id}", dependencies=[Depends(require_admin)])
 async def update(teacher_id: str, teacher: Teacher):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             async with conn.transaction():
                 await update_teacher(conn, teacher_id, teacher)
-                unprepared_courses = await get_teacher_courses(conn, teacher_id)
-                courses = prepare_teacher_courses(unprepared_courses)
-                for course in teacher.courses:
-                    if course not in courses:
-                        await add_course_teacher(conn, course.id, teacher_id)
-                for course in courses:
-                    if course not in teacher.courses:
-                        await delete_course_teacher(conn, course.id, teacher_id)
+                if teacher.courses is not None:
+                    await set_teacher_courses(conn, teacher_id, teacher_course_ids(teacher))
+        catalog_cache.invalidate("teachers", "course_teacher")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,24 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.security import HTTPBearer
-from db.user import add_user, get_user
-from db.database import db
+from fastapi import APIRouter, Depends, HTTPException
+from db.user import add_user, claim_student, claim_teacher, get_user, update_user_password
+from db.database import PoolTimeoutError, db
 from models.schemas import Login, User, UserOut
-from auth import AuthService
+from auth import HashingOverloaded, auth_service, get_optional_user
 
 router = APIRouter()
 
-auth_service = AuthService(config_path="config.json", db=db)
-auth_scheme = HTTPBearer()
+def overloaded(e: HashingOverloaded) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 @router.post("/register", response_model=UserOut)
-async def register_user(user: User):
+async def register_user(user: User, caller: UserOut | None = Depends(get_optional_user)):
     try:
-        async with db.pool.acquire() as conn:
+        password_hash = await auth_service.hash_password(user.password)
+        async with db.acquire() as conn:
             async with conn.transaction():
                 existing_user = await get_user(conn, user.username)
                 if existing_user:
                     raise HTTPException(status_code=400, detail="Username already exists")
-                user.password = auth_service.hash_password(user.password)
+                user.password = password_hash
 
                 if len(user.student_id) == 0:
                     user.student_id = None
@@ -26,25 +26,52 @@ async def register_user(user: User):
                     user.teacher_id = None
                 if (user.student_id == None and user.teacher_id == None) or (user.student_id != None and user.teacher_id != None):
                     raise HTTPException(status_code=404, detail="Fill in student id OR teacher id!")
+                user.role = "student" if user.student_id else "teacher"
+                # The role follows the id, so the id must name a real person
+                # without an account, and teacher accounts (which can grade)
+                # are only handed out by an admin.
+                if user.role == "teacher" and (caller is None or caller.role != "admin"):
+                    raise HTTPException(status_code=403, detail="Only an admin can create teacher accounts")
+                claims = await (claim_student(conn, user.student_id) if user.student_id else claim_teacher(conn, user.teacher_id))
+                if not claims:
+                    raise HTTPException(status_code=404, detail=f"{user.role.capitalize()} not found")
+                if any(claim["username"] for claim in claims):
+                    raise HTTPException(status_code=400, detail=f"This {user.role} already has an account")
             
                 await add_user(conn, user)
+                auth_service.invalidate_user(user.username)
                 return UserOut(
                     username=user.username,
                     role=user.role,
                     student_id=user.student_id,
                     teacher_id=user.teacher_id
                 )
+    except HashingOverloaded as e:
+        raise overloaded(e)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.post("/login")
 async def login_user(user: Login):
     try:
-        async with db.pool.acquire() as conn:
+        async with db.acquire() as conn:
             db_user = await get_user(conn, user.username)
-            if not db_user or not auth_service.verify_password(user.password, db_user["password"]):
-                raise HTTPException(status_code=401, detail="Invalid username or password")
-            token = auth_service.create_jwt(user.username, db_user["role"], db_user["student_id"], db_user["teacher_id"])
-            return {"token": token, "token_type": "bearer"}
+        if not db_user:
+            raise HTTPException(status_code=401, detail="Invalid username or password")
+        valid, new_hash = await auth_service.verify_and_update_password(user.password, db_user["password"])
+        if not valid:
+            raise HTTPException(status_code=401, detail="Invalid username or password")
+        if new_hash:
+            async with db.acquire() as conn:
+                await update_user_password(conn, user.username, new_hash)
+            auth_service.invalidate_user(user.username)
+        token = auth_service.create_jwt(user.username, db_user["role"], db_user["student_id"], db_user["teacher_id"])
+        return {"token": token, "token_type": "bearer"}
+    except HashingOverloaded as e:
+        raise overloaded(e)
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:      
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,102 @@
+import json
+from decimal import Decimal
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("fastapi")
+
+from utils.courses import prepare_course, prepare_courses, prepare_student_by_course
+from utils.serialization import (
+    COURSE_INFO_MAPPER,
+    COURSE_MAPPER,
+    STUDENT_INFO_MAPPER,
+    STUDENT_MAPPER,
+    STUDENT_WITH_SCORE_MAPPER,
+    TEACHER_MAPPER,
+    RecordMapper,
+    dumps,
+)
+from utils.students import prepare_student, prepare_students
+from utils.teachers import prepare_teachers
+
+# Rows shaped like the asyncpg records the read functions return: NUMERIC
+# columns arrive as Decimal, nullable columns as None and the json_agg columns
+# as JSON text.
+STUDENTS = [
+    {"student_id": "S000000001", "name": "Amina Ahmed", "sex": "female", "entrance_age": 18, "entrance_year": 2021, "class": "CS-21"},
+    {"student_id": "S000000002", "name": "Markus Müller", "sex": "male", "entrance_age": 19, "entrance_year": 2022, "class": "PH-22"},
+]
+
+COURSES = [
+    {"course_id": "C000001", "name": "Statistics", "credit": 4, "grade": Decimal("87.50"), "canceled_year": None},
+    {"course_id": "C000002", "name": "Philosophy", "credit": 2, "grade": Decimal("60.00"), "canceled_year": 2023},
+]
+
+TEACHERS = [
+    {"teacher_id": "T0001", "name": "Yuki Tanaka"},
+    {"teacher_id": "T0002", "name": "Elena Petrova"},
+]
+
+STUDENTS_WITH_SCORE = [
+    {"student_id": "S000000001", "student_name": "Amina Ahmed", "score": Decimal("91.25"), "chosen_year": 2022},
+    {"student_id": "S000000002", "student_name": "Markus Müller", "score": None, "chosen_year": 2023},
+]
+
+STUDENT_INFOS = [
+    {
+        **STUDENTS[0],
+        "average_score": Decimal("91.2500000000000000"),
+        "weighted_average_score": Decimal("90.1666666666666667"),
+        "course_count": 2,
+        "courses": json.dumps([
+            {"id": "C000001", "name": "Statistics", "credit": 4, "chosenYear": 2022, "score": 91.25},
+            {"id": "C000002", "name": "Philosophy", "credit": 2, "chosenYear": 2023, "score": None},
+        ]),
+    },
+    {**STUDENTS[1], "average_score": Decimal("0"), "weighted_average_score": Decimal("0"), "course_count": 0, "courses": "[]"},
+]
+
+COURSE_INFOS = [
+    {
+        **COURSES[0],
+        "average_score": Decimal("91.2500000000000000"),
+        "student_count": 2,
+        "students": json.dumps([
+            {"id": "S000000001", "name": "Amina Ahmed", "score": 91.25, "chosenYear": 2022},
+            {"id": "S000000002", "name": "Markus Müller", "score": None, "chosenYear": 2023},
+        ]),
+    },
+    {**COURSES[1], "average_score": Decimal("0"), "student_count": 0, "students": "[]"},
+]
+
+def fast(records, mapper: RecordMapper) -> list:
+    return json.loads(dumps([mapper(record) for record in records]))
+
+def model(models) -> list:
+    return json.loads(json.dumps([item.model_dump(mode="json") for item in models]))
+
+@pytest.mark.parametrize(
+    "records, mapper, prepare",
+    [
+        (STUDENTS, STUDENT_MAPPER, prepare_students),
+        (COURSES, COURSE_MAPPER, prepare_courses),
+        (TEACHERS, TEACHER_MAPPER, prepare_teachers),
+        (STUDENTS_WITH_SCORE, STUDENT_WITH_SCORE_MAPPER, prepare_student_by_course),
+        (STUDENT_INFOS, STUDENT_INFO_MAPPER, lambda records: [prepare_student(record) for record in records]),
+        (COURSE_INFOS, COURSE_INFO_MAPPER, lambda records: [prepare_course(record) for record in records]),
+    ],
+    ids=["student", "course", "teacher", "student_with_score", "student_info", "course_info"],
+)
+def test_mapper_matches_model(records, mapper, prepare):
+    expected = model(prepare(records))
+    actual = fast(records, mapper)
+    assert actual == expected
+    # Same fields in the same order, so both paths produce the same bytes shape.
+    assert [list(item) for item in actual] == [list(item) for item in expected]
+
+def test_projection_matches_model_subset():
+    fields = ("id", "averageScore", "students")
+    mapper = COURSE_INFO_MAPPER.only(fields)
+    records = [{column: record[column] for column in COURSE_INFO_MAPPER.columns_for(fields)} for record in COURSE_INFOS]
+    expected = [{field: item[field] for field in fields} for item in model(prepare_course(record) for record in COURSE_INFOS)]
+    assert fast(records, mapper) == expected
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+from collections import deque
+from urllib.parse import parse_qs
+from config import AdmissionConfig, settings
+from .metrics import LATENCY_BUCKETS, Histogram, metrics
+
+# Not admission controlled: cheap or self-limited endpoints (login has its own
+# hashing queue), and the long-lived /events streams, which hold no connection.
+EXEMPT_PREFIXES = ("/metrics", "/events", "/internal", "/auth", "/docs", "/redoc", "/openapi.json")
+FULL_LISTS = {"/students", "/teachers", "/courses", "/class"}
+
+class Overloaded(Exception):
+    pass
+
+class RouteClass:
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {"queue_full": 0, "timeout": 0}
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queueSize": self.queue_size,
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": dict(self.shed),
+        }
+
+def classify(method: str, path: str, query_string: bytes) -> str | None:
+    if method == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if method not in ("GET", "HEAD"):
+        return "write"
+    if path.startswith("/export"):
+        return "heavy"
+    if path.rstrip("/") in FULL_LISTS and "limit" not in parse_qs(query_string.decode("latin-1")):
+        return "heavy"
+    return "read"
+
+# Caps the requests running at once per worker at about what the pools can serve,
+# so the excess waits here, in priority order, instead of inside pool.acquire().
+# Classes are listed by priority: a freed slot goes to a waiting write before a
+# read, and to a read before a heavy read (exports and unpaginated lists), which
+# also have a small limit of their own. A full queue or a wait longer than
+# queue_timeout sheds the request with 503.
+class AdmissionController:
+    def __init__(self, config: AdmissionConfig = settings.admission):
+        self.config = config
+        database = settings.database
+        self.capacity = config.capacity or database.max_size * (1 + len(database.get_replicas()))
+        self.active = 0
+        self.classes = {
+            "write": RouteClass("write", self.capacity, config.queue_size),
+            "read": RouteClass("read", self.capacity, config.queue_size),
+            "heavy": RouteClass("heavy", min(config.heavy_limit, self.capacity), config.heavy_queue_size),
+        }
+
+    def can_run(self, route_class: RouteClass) -> bool:
+        return self.active < self.capacity and route_class.active < route_class.limit
+
+    def start(self, route_class: RouteClass):
+        self.active += 1
+        route_class.active += 1
+        route_class.admitted += 1
+
+    async def admit(self, route_class: RouteClass):
+        if self.can_run(route_class) and not route_class.waiters:
+            self.start(route_class)
+            route_class.queue_wait.observe(0)
+            return
+        if len(route_class.waiters) >= route_class.queue_size:
+            route_class.shed["queue_full"] += 1
+            raise Overloaded()
+        future = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(future)
+        route_class.queued += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, self.config.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            granted = future.done() and not future.cancelled()
+            if not granted and future in route_class.waiters:
+                route_class.waiters.remove(future)
+            if isinstance(e, asyncio.CancelledError):
+                if granted:
+                    self.release(route_class)
+                raise
+            if not granted:
+                route_class.shed["timeout"] += 1
+                raise Overloaded()
+        route_class.queue_wait.observe(time.perf_counter() - started)
+
+    def release(self, route_class: RouteClass):
+        self.active -= 1
+        route_class.active -= 1
+        for waiting_class in self.classes.values():
+            while waiting_class.waiters and self.can_run(waiting_class):
+                future = waiting_class.waiters.popleft()
+                if not future.done():
+                    self.start(waiting_class)
+                    future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.config.enabled,
+            "capacity": self.capacity,
+            "active": self.active,
+            "classes": {name: route_class.stats() for name, route_class in self.classes.items()},
+        }
+
+    def render(self) -> list[str]:
+        lines = []
+        counters = (
+            ("http_admission_admitted_total", "counter", "Requests admitted per route class", lambda route_class: route_class.admitted),
+            ("http_admission_queued_total", "counter", "Requests that had to wait for admission", lambda route_class: route_class.queued),
+            ("http_admission_active", "gauge", "Requests running per route class", lambda route_class: route_class.active),
+            ("http_admission_waiting", "gauge", "Requests waiting for admission per route class", lambda route_class: len(route_class.waiters)),
+        )
+        for name, kind, description, value in counters:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for class_name, route_class in self.classes.items():
+                lines.append(f'{name}{{class="{class_name}"}} {value(route_class)}')
+        lines.append("# HELP http_admission_shed_total Requests rejected with 503 per route class and reason")
+        lines.append("# TYPE http_admission_shed_total counter")
+        for class_name, route_class in self.classes.items():
+            for reason, count in route_class.shed.items():
+                lines.append(f'http_admission_shed_total{{class="{class_name}",reason="{reason}"}} {count}')
+        lines.append("# HELP http_admission_wait_seconds Time spent waiting for admission")
+        lines.append("# TYPE http_admission_wait_seconds histogram")
+        for class_name, route_class in self.classes.items():
+            lines.extend(route_class.queue_wait.render("http_admission_wait_seconds", f'class="{class_name}"'))
+        return lines
+
+admission = AdmissionController()
+metrics.register(admission.render)
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.controller.config.enabled:
+            await self.app(scope, receive, send)
+            return
+        name = classify(scope["method"], scope["path"], scope["query_string"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.controller.classes[name]
+        try:
+            await self.controller.admit(route_class)
+        except Overloaded:
+            await self.reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+    async def reject(self, send):
+        body = json.dumps({"detail": "Server is busy, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.controller.config.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
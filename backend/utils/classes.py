@@ -0,0 +1,32 @@
+from models.schemas import ClassInfo, ClassSummary
+from .metrics import timed_serialization
+from .students import create_student
+
+def create_class_summary(summary):
+    return ClassSummary(
+        className=summary['class'],
+        studentCount=summary['student_count'],
+        averageScore=summary['average_score'],
+        minScore=summary['min_score'],
+        maxScore=summary['max_score'],
+        enrollmentCount=summary['enrollment_count']
+    )
+
+@timed_serialization
+def prepare_class_summaries(summaries):
+    result = []
+    for summary in summaries:
+        result.append(create_class_summary(summary))
+    return result
+
+@timed_serialization
+def prepare_class_info(summary, students):
+    return ClassInfo(
+        className=summary['class'],
+        studentCount=summary['student_count'],
+        averageScore=summary['average_score'],
+        minScore=summary['min_score'],
+        maxScore=summary['max_score'],
+        enrollmentCount=summary['enrollment_count'],
+        students=[create_student(student) for student in students]
+    )
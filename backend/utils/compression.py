@@ -0,0 +1,131 @@
+import gzip
+import time
+from config import CompressionConfig, settings
+from .metrics import record_compression
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/plain", b"text/csv", b"application/x-ndjson")
+# A compressed body is a different representation, so it gets its own strong
+# ETag: the route's tag with the encoding appended inside the quotes.
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+def negotiate(accept_encoding: str) -> str | None:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return None
+
+def strip_etag_suffix(etag: str) -> tuple[str, str | None]:
+    for suffix in ETAG_SUFFIXES.values():
+        if etag.endswith(suffix + '"'):
+            return etag[:-len(suffix) - 1] + '"', suffix
+    return etag, None
+
+def add_etag_suffix(etag: str, suffix: str) -> str:
+    return etag[:-1] + suffix + '"' if etag.endswith('"') else etag
+
+def get_header(headers: list, name: bytes) -> bytes | None:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def set_header(headers: list, name: bytes, value: bytes):
+    headers[:] = [(key, existing) for key, existing in headers if key.lower() != name]
+    headers.append((name, value))
+
+# Compresses complete JSON/text bodies of at least minimum_size bytes with brotli
+# (when the package is installed) or gzip, as the client's Accept-Encoding allows.
+# Streamed bodies (exports, /events) pass through untouched: SSE must not be
+# buffered, and exports are sent chunk by chunk.
+class CompressionMiddleware:
+    def __init__(self, app, config: CompressionConfig = settings.compression):
+        self.app = app
+        self.config = config
+
+    def compress(self, body: bytes, coding: str) -> bytes:
+        started = time.perf_counter()
+        try:
+            if coding == "br":
+                return brotli.compress(body, quality=self.config.brotli_quality)
+            return gzip.compress(body, compresslevel=self.config.gzip_level)
+        finally:
+            record_compression(time.perf_counter() - started)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate((get_header(scope["headers"], b"accept-encoding") or b"").decode("latin-1"))
+        # Routes compare If-None-Match with their own tag, so the encoding suffix
+        # is taken off here and put back on the 304.
+        request_headers = list(scope["headers"])
+        client_suffix = None
+        if_none_match = get_header(request_headers, b"if-none-match")
+        if if_none_match:
+            candidates = []
+            for candidate in if_none_match.decode("latin-1").split(","):
+                candidate, suffix = strip_etag_suffix(candidate.strip())
+                client_suffix = client_suffix or suffix
+                candidates.append(candidate)
+            set_header(request_headers, b"if-none-match", ", ".join(candidates).encode("latin-1"))
+            scope = {**scope, "headers": request_headers}
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            headers = list(held.get("headers", []))
+            body = message.get("body", b"")
+            content_type = get_header(headers, b"content-type") or b""
+            etag = get_header(headers, b"etag")
+            if content_type.startswith(COMPRESSIBLE_TYPES) or held["status"] == 304:
+                vary = get_header(headers, b"vary")
+                if not vary or b"accept-encoding" not in vary.lower():
+                    set_header(headers, b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding")
+            if held["status"] == 304:
+                if etag and client_suffix:
+                    set_header(headers, b"etag", add_etag_suffix(etag.decode("latin-1"), client_suffix).encode("latin-1"))
+            elif (
+                coding
+                and not message.get("more_body", False)
+                and len(body) >= self.config.minimum_size
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                and get_header(headers, b"content-encoding") is None
+            ):
+                body = self.compress(body, coding)
+                set_header(headers, b"content-encoding", coding.encode())
+                set_header(headers, b"content-length", str(len(body)).encode())
+                if etag:
+                    set_header(headers, b"etag", add_etag_suffix(etag.decode("latin-1"), ETAG_SUFFIXES[coding]).encode("latin-1"))
+                message = {**message, "body": body}
+            await send({**held, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,4 +1,6 @@
-from models.schemas import ChosenCourse, Course, CourseChoosing, CourseInfo, StudentWithScore
+import json
+from models.schemas import ChosenCourse, Course, CourseChoosing, CourseInfo, ScoreReport, ScoreResult, StudentWithScore
+from .metrics import timed_serialization
 
 def create_course(course):
     return Course(
@@ -9,6 +11,7 @@ def create_course(course):
         canceledYear=course['canceled_year'],
     )
 
+@timed_serialization
 def prepare_courses(courses):
     result = []
     for course in courses:
@@ -24,31 +27,27 @@ def create_chosen_course(course):
         score=course['score']
     )
 
+@timed_serialization
 def prepare_chosen_courses(courses):
     result = []
     for course in courses:
         result.append(create_chosen_course(course))
     return result
 
-def get_course_average_score(studentsGrades):
-    total_score = 0
-    count = 0
-    for grade in studentsGrades:
-        if grade['score'] is not None:
-            total_score += grade['score']
-            count += 1
-    return total_score / count if count > 0 else 0
-
-def prepare_course(course, studentsGrades):
+@timed_serialization
+def prepare_course(course):
     return CourseInfo(
             id=course['course_id'],
             name=course['name'],
             credit=course['credit'],
             grade=course['grade'],
             canceledYear=course['canceled_year'],
-            averageScore=get_course_average_score(studentsGrades)
+            averageScore=course['average_score'],
+            studentCount=course['student_count'],
+            students=json.loads(course['students'])
         )
 
+@timed_serialization
 def prepare_student_by_course(students):
     result = []
     for student in students:
@@ -60,6 +59,15 @@ def prepare_student_by_course(students):
         ))
     return result
 
+@timed_serialization
+def prepare_score_report(rows):
+    results = [ScoreResult(studentId=row["student_id"], status=row["status"], score=row["score"]) for row in rows]
+    return ScoreReport(
+        total=len(results),
+        updated=sum(1 for result in results if result.status == "updated"),
+        results=results
+    )
+
 def create_course_choosing(course_choosing):
     return CourseChoosing(
         studentId=course_choosing['student_id'],
@@ -68,6 +76,7 @@ def create_course_choosing(course_choosing):
         score=course_choosing['score']
     )
 
+@timed_serialization
 def prepare_course_choosing(course_choosing):
     course_choosing_result = []
     for course_choosing_item in course_choosing:
@@ -81,13 +90,4 @@ def create_chosen_course(course):
         credit=course['credit'],
         chosenYear=course['chosen_year'],
         score=course['score']
-    )
-
-def compute_average_score(courses):
-    total_score = 0
-    count = 0
-    for course in courses:
-        if course['score'] is not None:
-            total_score += course['score']
-            count += 1
-    return total_score / count if count > 0 else 0
\ No newline at end of file
+    )
\ No newline at end of file
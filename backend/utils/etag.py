@@ -0,0 +1,38 @@
+import hashlib
+from fastapi import Request, Response
+from config import settings
+
+ETAG_HEADER = "ETag"
+CACHE_CONTROL = "private, no-cache"
+# Responses are read with the caller's token, and some differ by caller.
+VARY = "Authorization"
+
+def make_etag(request: Request, versions: dict[str, int], variant: str = "") -> str:
+    # variant names anything besides the URL that shapes the body, e.g. the
+    # fields left after role-based stripping, so two representations of the same
+    # URL never share a strong ETag.
+    key = "|".join([
+        request.url.path,
+        str(request.url.query),
+        "fast" if settings.api.fast_json else "model",
+        variant,
+        *(f"{table}={version}" for table, version in sorted(versions.items())),
+    ])
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # If-None-Match uses the weak comparison, so W/"x" matches "x".
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def not_modified(request: Request, response: Response, versions: dict[str, int], variant: str = "") -> Response | None:
+    etag = make_etag(request, versions, variant)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY})
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["Vary"] = VARY
+    return None
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+CHUNK_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def encode_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+async def ndjson_chunks(records, columns: list[str]):
+    lines = []
+    async for record in records:
+        lines.append(json.dumps({column: encode_value(record[column]) for column in columns}, ensure_ascii=False))
+        if len(lines) >= CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+async def csv_chunks(records, columns: list[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    count = 0
+    async for record in records:
+        writer.writerow([record[column] for column in columns])
+        count += 1
+        if count >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if count:
+        yield buffer.getvalue()
+
+def format_chunks(fmt: str, records, columns: list[str]):
+    if fmt == "csv":
+        return csv_chunks(records, columns)
+    return ndjson_chunks(records, columns)
@@ -0,0 +1,16 @@
+from fastapi import HTTPException
+from .serialization import RecordMapper
+
+def parse_fields(fields: str | None, mapper: RecordMapper) -> tuple[str, ...] | None:
+    # ?fields=id,name: a whitelist of the mapper's output fields. id is always
+    # kept (pagination cursors and clients rely on it) and the result follows the
+    # mapper's order, so the same set always maps to the same projected query.
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    allowed = mapper.field_names()
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(field for field in allowed if field in requested)
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from models.schemas import ImportedRow, ImportReport, ImportRowError
+from .metrics import timed_serialization
+
+def normalize_value(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value if value else None
+
+def parse_csv(content: str, columns: list[str]):
+    reader = csv.DictReader(io.StringIO(content))
+    missing = [column for column in columns if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return [
+        (number, *[normalize_value(row[column]) for column in columns])
+        for number, row in enumerate(reader, start=1)
+    ]
+
+def parse_ndjson(content: str, columns: list[str]):
+    records = []
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}")
+        if not isinstance(row, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        records.append((len(records) + 1, *[normalize_value(row.get(column)) for column in columns]))
+    return records
+
+def parse_records(content: str, fmt: str, columns: list[str]):
+    if fmt == "ndjson":
+        return parse_ndjson(content, columns)
+    return parse_csv(content, columns)
+
+@timed_serialization
+def prepare_import_report(rows):
+    errors = []
+    ids = []
+    for row in rows:
+        if row["error"] is not None:
+            errors.append(ImportRowError(row=row["row_number"], error=row["error"]))
+        elif row["new_id"] is not None:
+            ids.append(ImportedRow(row=row["row_number"], id=row["new_id"]))
+    return ImportReport(
+        total=len(rows),
+        imported=len(rows) - len(errors),
+        errors=errors,
+        ids=ids
+    )
@@ -0,0 +1,185 @@
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+
+class LatencyWindow:
+    def __init__(self, size: int = 1024):
+        self.samples: deque = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, *quantiles: float) -> dict:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {f"p{round(q * 100)}": None for q in quantiles}
+        return {
+            f"p{round(q * 100)}": round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+            for q in quantiles
+        }
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+class RequestTimings:
+    __slots__ = ("db_queries", "db_seconds", "acquire_seconds", "serialization_seconds", "compression_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.compression_seconds = 0.0
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+def record_db(seconds: float):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.db_seconds += seconds
+
+def record_acquire(seconds: float):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.acquire_seconds += seconds
+
+def record_serialization(seconds: float):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.serialization_seconds += seconds
+
+def record_compression(seconds: float):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.compression_seconds += seconds
+
+def timed_serialization(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_serialization(time.perf_counter() - started)
+    return wrapper
+
+class RouteMetrics:
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_queries = Histogram(COUNT_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.acquire_wait = Histogram(LATENCY_BUCKETS)
+        self.serialization_time = Histogram(LATENCY_BUCKETS)
+        self.compression_time = Histogram(LATENCY_BUCKETS)
+
+    def observe(self, status: int, seconds: float, timings: RequestTimings):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latency.observe(seconds)
+        self.db_queries.observe(timings.db_queries)
+        self.db_time.observe(timings.db_seconds)
+        self.acquire_wait.observe(timings.acquire_seconds)
+        self.serialization_time.observe(timings.serialization_seconds)
+        self.compression_time.observe(timings.compression_seconds)
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.collectors: list = []
+
+    def register(self, collector):
+        # collector() returns extra exposition lines, rendered after the routes.
+        self.collectors.append(collector)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timings: RequestTimings):
+        key = (method, route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        metrics.observe(status, seconds, timings)
+
+    def render(self) -> str:
+        histograms = (
+            ("http_request_duration_seconds", "latency", "Request latency"),
+            ("http_request_db_queries", "db_queries", "Database round-trips per request"),
+            ("http_request_db_seconds", "db_time", "Time spent in SQL per request"),
+            ("http_request_pool_wait_seconds", "acquire_wait", "Time spent waiting for a pool connection per request"),
+            ("http_request_serialization_seconds", "serialization_time", "Time spent building and rendering response bodies per request"),
+            ("http_request_compression_seconds", "compression_time", "Time spent compressing response bodies per request"),
+        )
+        lines = ["# HELP http_requests_total Requests handled", "# TYPE http_requests_total counter"]
+        for (method, route), metrics in sorted(self.routes.items()):
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        for name, attribute, description in histograms:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), metrics in sorted(self.routes.items()):
+                lines.extend(getattr(metrics, attribute).render(name, f'method="{method}",route="{route}"'))
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_timings.reset(token)
+            route = scope.get("route")
+            self.registry.observe(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+                timings
+            )
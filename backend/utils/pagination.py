@@ -0,0 +1,8 @@
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+def set_next_cursor(response: Response, rows, limit: int | None, key: str):
+    if limit is not None and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = rows[-1][key]
@@ -0,0 +1,9 @@
+from models.schemas import SearchHit, SearchResults
+from .metrics import timed_serialization
+
+@timed_serialization
+def prepare_search_results(rows):
+    groups = {"student": [], "teacher": [], "course": []}
+    for row in rows:
+        groups[row["kind"]].append(SearchHit(id=row["id"], name=row["name"], similarity=row["similarity"]))
+    return SearchResults(students=groups["student"], teachers=groups["teacher"], courses=groups["course"])
@@ -0,0 +1,133 @@
+import json
+import time
+from decimal import Decimal
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from .metrics import record_serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def to_float(value):
+    return float(value) if value is not None else None
+
+def from_json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+class RecordMapper:
+    def __init__(self, fields: list[tuple]):
+        self.fields = tuple(fields)
+        self.constants = {field: None for field, column, _ in self.fields if column is None}
+        self.columns = tuple((field, column, convert) for field, column, convert in self.fields if column is not None)
+
+    def __call__(self, record) -> dict:
+        result = {
+            field: convert(record[column]) if convert else record[column]
+            for field, column, convert in self.columns
+        }
+        if self.constants:
+            result.update(self.constants)
+        return result
+
+    def field_names(self) -> tuple[str, ...]:
+        return tuple(field for field, _, _ in self.fields)
+
+    def only(self, fields: tuple[str, ...]) -> "RecordMapper":
+        return RecordMapper([entry for entry in self.fields if entry[0] in fields])
+
+    def columns_for(self, fields: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(column for field, column, _ in self.fields if field in fields and column is not None)
+
+STUDENT_MAPPER = RecordMapper([
+    ("id", "student_id", None),
+    ("name", "name", None),
+    ("sex", "sex", None),
+    ("entranceAge", "entrance_age", None),
+    ("entranceYear", "entrance_year", None),
+    ("studentClass", "class", None),
+])
+
+COURSE_MAPPER = RecordMapper([
+    ("id", "course_id", None),
+    ("name", "name", None),
+    ("credit", "credit", to_float),
+    ("grade", "grade", to_float),
+    ("canceledYear", "canceled_year", None),
+])
+
+TEACHER_MAPPER = RecordMapper([
+    ("id", "teacher_id", None),
+    ("name", "name", None),
+    ("courses", None, None),
+])
+
+STUDENT_INFO_MAPPER = RecordMapper([
+    ("id", "student_id", None),
+    ("name", "name", None),
+    ("sex", "sex", None),
+    ("entranceAge", "entrance_age", None),
+    ("entranceYear", "entrance_year", None),
+    ("studentClass", "class", None),
+    ("averageScore", "average_score", to_float),
+    ("weightedAverageScore", "weighted_average_score", to_float),
+    ("courseCount", "course_count", None),
+    ("courses", "courses", from_json),
+])
+
+COURSE_INFO_MAPPER = RecordMapper([
+    ("id", "course_id", None),
+    ("name", "name", None),
+    ("credit", "credit", to_float),
+    ("grade", "grade", to_float),
+    ("canceledYear", "canceled_year", None),
+    ("averageScore", "average_score", to_float),
+    ("studentCount", "student_count", None),
+    ("students", "students", from_json),
+])
+
+STUDENT_WITH_SCORE_MAPPER = RecordMapper([
+    ("id", "student_id", None),
+    ("name", "student_name", None),
+    ("score", "score", to_float),
+    ("chosenYear", "chosen_year", None),
+])
+
+def default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+class TimedJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        try:
+            return super().render(content)
+        finally:
+            record_serialization(time.perf_counter() - started)
+
+def records_response(records, mapper: RecordMapper, response: Response = None) -> Response:
+    started = time.perf_counter()
+    content = dumps([mapper(record) for record in records])
+    record_serialization(time.perf_counter() - started)
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None
+    )
+
+def record_response(record, mapper: RecordMapper, response: Response = None) -> Response:
+    started = time.perf_counter()
+    content = dumps(mapper(record))
+    record_serialization(time.perf_counter() - started)
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None
+    )
@@ -1,5 +1,6 @@
+import json
 from models import schemas
-from .courses import compute_average_score, create_chosen_course
+from .metrics import timed_serialization
 
 def create_student(student):
     return schemas.Student(
@@ -11,13 +12,15 @@ def create_student(student):
         studentClass=student['class']
     )
 
+@timed_serialization
 def prepare_students(students):
     students_result = []
     for student in students:
         students_result.append(create_student(student))
     return students_result
 
-def prepare_student(student, courses):
+@timed_serialization
+def prepare_student(student):
     return schemas.StudentInfo(
         id=student['student_id'],
         name=student['name'],
@@ -25,6 +28,8 @@ def prepare_student(student, courses):
         entranceAge=student['entrance_age'],
         entranceYear=student['entrance_year'],
         studentClass=student['class'],
-        averageScore=compute_average_score(courses),
-        courses=[create_chosen_course(course) for course in courses]
+        averageScore=student['average_score'],
+        weightedAverageScore=student['weighted_average_score'],
+        courseCount=student['course_count'],
+        courses=json.loads(student['courses'])
     )
\ No newline at end of file
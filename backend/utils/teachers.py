@@ -1,5 +1,6 @@
 from models import schemas
 from .courses import create_course
+from .metrics import timed_serialization
 
 def create_teacher(teacher):
     return schemas.Teacher(
@@ -8,18 +9,24 @@ def create_teacher(teacher):
         courses=[create_course(course) for course in teacher['courses']] if 'courses' in teacher else None
     )
 
+@timed_serialization
 def prepare_teachers(teachers):
     teachers_result = []
     for teacher in teachers:
         teachers_result.append(create_teacher(teacher))
     return teachers_result
 
+@timed_serialization
 def prepare_teacher_courses(courses):
     courses_result = []
     for course in courses:
         courses_result.append(create_course(course))
     return courses_result
 
+def teacher_course_ids(teacher):
+    return {course.id for course in teacher.courses or []}
+
+@timed_serialization
 def prepare_teacher_details(teacher, courses):
     return schemas.TeacherDetails(
         id=teacher["teacher_id"],
@@ -1,5 +1,7 @@
 from models.schemas import UserOut
+from .metrics import timed_serialization
 
+@timed_serialization
 def prepare_user(user):
     return UserOut(
         username=user["username"],
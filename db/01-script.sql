@@ -51,6 +51,26 @@ CREATE TABLE users (
     FOREIGN KEY (teacher_id) REFERENCES teachers(teacher_id) ON DELETE CASCADE
 );
 
+CREATE TABLE statistics_counters (
+    slot SMALLINT PRIMARY KEY,
+    total_students BIGINT NOT NULL DEFAULT 0,
+    total_teachers BIGINT NOT NULL DEFAULT 0,
+    total_courses BIGINT NOT NULL DEFAULT 0,
+    score_sum NUMERIC NOT NULL DEFAULT 0,
+    score_count BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO statistics_counters (slot) SELECT generate_series(0, 15);
+
+CREATE TABLE class_statistics (
+    class VARCHAR(20) PRIMARY KEY,
+    student_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- INDEXES
+
+CREATE INDEX IF NOT EXISTS idx_students_class ON students (class, student_id);
+
 -- SEQUENCES
 
 CREATE SEQUENCE IF NOT EXISTS student_id_seq;
@@ -73,6 +93,33 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_students_page(
+    p_after CHAR(10),
+    p_limit INT,
+    p_class VARCHAR,
+    p_entrance_year INT,
+    p_sex VARCHAR
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT * FROM students s
+    WHERE (p_after IS NULL OR s.student_id > p_after)
+      AND (p_class IS NULL OR s.class = p_class)
+      AND (p_entrance_year IS NULL OR s.entrance_year = p_entrance_year)
+      AND (p_sex IS NULL OR s.sex = p_sex)
+    ORDER BY s.student_id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION get_student(
     p_student_id CHAR(10)
 )
@@ -89,6 +136,55 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_student_info(
+    p_student_id CHAR(10)
+)
+RETURNS TABLE (
+    student_id CHAR(10),
+    name VARCHAR,
+    sex VARCHAR,
+    entrance_age INT,
+    entrance_year INT,
+    class VARCHAR,
+    average_score NUMERIC,
+    weighted_average_score NUMERIC,
+    course_count INT,
+    courses JSON
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        s.student_id,
+        s.name,
+        s.sex,
+        s.entrance_age,
+        s.entrance_year,
+        s.class,
+        COALESCE(agg.average_score, 0),
+        COALESCE(agg.weighted_average_score, 0),
+        agg.course_count,
+        COALESCE(agg.courses, '[]'::JSON)
+    FROM students s
+    CROSS JOIN LATERAL (
+        SELECT
+            AVG(cc.score) AS average_score,
+            SUM(cc.score * c.credit) / NULLIF(SUM(c.credit) FILTER (WHERE cc.score IS NOT NULL), 0) AS weighted_average_score,
+            COUNT(*)::INT AS course_count,
+            json_agg(json_build_object(
+                'id', c.course_id,
+                'name', c.name,
+                'credit', c.credit,
+                'chosenYear', cc.chosen_year,
+                'score', cc.score
+            ) ORDER BY c.course_id) AS courses
+        FROM course_choosing cc
+        JOIN courses c ON c.course_id = cc.course_id
+        WHERE cc.student_id = s.student_id
+    ) agg
+    WHERE s.student_id = p_student_id;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION get_student_courses(p_student_id CHAR(10))
 RETURNS TABLE (
     id CHAR(7),
@@ -134,6 +230,44 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_class_summaries(
+    p_class VARCHAR
+)
+RETURNS TABLE (
+    class VARCHAR,
+    student_count INT,
+    average_score NUMERIC(5,2),
+    min_score NUMERIC(5,2),
+    max_score NUMERIC(5,2),
+    enrollment_count INT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        s.class,
+        COUNT(*)::INT,
+        ROUND(SUM(e.score_sum) / NULLIF(SUM(e.score_count), 0), 2),
+        MIN(e.min_score),
+        MAX(e.max_score),
+        COALESCE(SUM(e.enrollment_count), 0)::INT
+    FROM students s
+    LEFT JOIN (
+        SELECT
+            cc.student_id,
+            SUM(cc.score) AS score_sum,
+            COUNT(cc.score) AS score_count,
+            MIN(cc.score) AS min_score,
+            MAX(cc.score) AS max_score,
+            COUNT(*) AS enrollment_count
+        FROM course_choosing cc
+        GROUP BY cc.student_id
+    ) e ON e.student_id = s.student_id
+    WHERE p_class IS NULL OR s.class = p_class
+    GROUP BY s.class
+    ORDER BY s.class;
+END;
+$$ LANGUAGE plpgsql;
+
 -- STUDENTS RELATED PROCEDURES
 
 CREATE OR REPLACE PROCEDURE insert_student(
@@ -237,6 +371,37 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_teachers_page(
+    p_after CHAR(5),
+    p_limit INT
+)
+RETURNS TABLE (
+    teacher_id CHAR(5),
+    name VARCHAR
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT * FROM teachers t
+    WHERE (p_after IS NULL OR t.teacher_id > p_after)
+    ORDER BY t.teacher_id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION teaches_course(
+    p_teacher_id CHAR(5),
+    p_course_id CHAR(7)
+)
+RETURNS BOOLEAN AS $$
+BEGIN
+    RETURN EXISTS (
+        SELECT 1 FROM course_teacher ct
+        WHERE ct.teacher_id = p_teacher_id
+          AND ct.course_id = p_course_id
+    );
+END;
+$$ LANGUAGE plpgsql;
+
 -- TEACHERS RELATED PROCEDURES
 
 CREATE OR REPLACE PROCEDURE update_teacher(
@@ -275,6 +440,28 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_courses_page(
+    p_after CHAR(7),
+    p_limit INT,
+    p_canceled_year INT
+)
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT * FROM courses c
+    WHERE (p_after IS NULL OR c.course_id > p_after)
+      AND (p_canceled_year IS NULL OR c.canceled_year = p_canceled_year)
+    ORDER BY c.course_id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION get_course_choosings()
 RETURNS TABLE (
     student_id CHAR(10),
@@ -300,6 +487,49 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION get_course_info(
+    p_course_id CHAR(7)
+)
+RETURNS TABLE (
+    course_id CHAR(7),
+    name VARCHAR,
+    credit INT,
+    grade NUMERIC,
+    canceled_year INT,
+    average_score NUMERIC,
+    student_count INT,
+    students JSON
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        c.course_id,
+        c.name,
+        c.credit,
+        c.grade,
+        c.canceled_year,
+        COALESCE(agg.average_score, 0),
+        agg.student_count,
+        COALESCE(agg.students, '[]'::JSON)
+    FROM courses c
+    CROSS JOIN LATERAL (
+        SELECT
+            AVG(cc.score) AS average_score,
+            COUNT(*)::INT AS student_count,
+            json_agg(json_build_object(
+                'id', s.student_id,
+                'name', s.name,
+                'score', cc.score,
+                'chosenYear', cc.chosen_year
+            ) ORDER BY s.student_id) AS students
+        FROM course_choosing cc
+        JOIN students s ON s.student_id = cc.student_id
+        WHERE cc.course_id = c.course_id
+    ) agg
+    WHERE c.course_id = p_course_id;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION get_course_scores(p_course_id CHAR(7))
 RETURNS TABLE (
     student_id CHAR(10),
@@ -424,6 +654,24 @@ BEGIN
 END;
 $$;
 
+CREATE OR REPLACE PROCEDURE set_teacher_courses(
+    p_teacher_id CHAR(5),
+    p_course_ids CHAR(7)[]
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM course_teacher
+    WHERE teacher_id = p_teacher_id
+      AND course_id <> ALL (COALESCE(p_course_ids, '{}'));
+
+    INSERT INTO course_teacher (course_id, teacher_id)
+    SELECT DISTINCT c.course_id, p_teacher_id
+    FROM unnest(p_course_ids) AS c(course_id)
+    ON CONFLICT (course_id, teacher_id) DO NOTHING;
+END;
+$$;
+
 CREATE OR REPLACE PROCEDURE insert_course_choosing(
     p_student_id CHAR(10),
     p_course_id CHAR(7),
@@ -457,6 +705,26 @@ BEGIN
 END;
 $$;
 
+CREATE OR REPLACE PROCEDURE set_student_courses(
+    p_student_id CHAR(10),
+    p_course_ids CHAR(7)[]
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_current_year INT := EXTRACT(YEAR FROM CURRENT_DATE);
+BEGIN
+    DELETE FROM course_choosing
+    WHERE student_id = p_student_id
+      AND course_id <> ALL (COALESCE(p_course_ids, '{}'));
+
+    INSERT INTO course_choosing (student_id, course_id, chosen_year, score)
+    SELECT DISTINCT p_student_id, c.course_id, v_current_year, NULL::NUMERIC
+    FROM unnest(p_course_ids) AS c(course_id)
+    ON CONFLICT (student_id, course_id) DO NOTHING;
+END;
+$$;
+
 CREATE OR REPLACE PROCEDURE update_course_choosing(
     p_student_id CHAR(10),
     p_course_id CHAR(7),
@@ -525,11 +793,59 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     SELECT
-        (SELECT COUNT(*)::INT FROM students),
-        (SELECT COUNT(*)::INT FROM teachers),
-        (SELECT COUNT(*)::INT FROM courses),
-        (SELECT COUNT(DISTINCT class)::INT FROM students),
-        (SELECT ROUND(AVG(score), 2) FROM course_choosing WHERE score IS NOT NULL);
+        SUM(c.total_students)::INT,
+        SUM(c.total_teachers)::INT,
+        SUM(c.total_courses)::INT,
+        (SELECT COUNT(*)::INT FROM class_statistics),
+        ROUND(SUM(c.score_sum) / NULLIF(SUM(c.score_count), 0), 2)
+    FROM statistics_counters c;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION check_statistics()
+RETURNS TABLE (
+    metric TEXT,
+    maintained NUMERIC,
+    actual NUMERIC
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH counted AS (
+        SELECT
+            SUM(c.total_students) AS total_students,
+            SUM(c.total_teachers) AS total_teachers,
+            SUM(c.total_courses) AS total_courses,
+            SUM(c.score_sum) AS score_sum,
+            SUM(c.score_count) AS score_count
+        FROM statistics_counters c
+    ), recounted AS (
+        SELECT
+            (SELECT COUNT(*) FROM students) AS total_students,
+            (SELECT COUNT(*) FROM teachers) AS total_teachers,
+            (SELECT COUNT(*) FROM courses) AS total_courses,
+            (SELECT COALESCE(SUM(cc.score), 0) FROM course_choosing cc) AS score_sum,
+            (SELECT COUNT(cc.score) FROM course_choosing cc) AS score_count
+    )
+    SELECT v.metric, v.maintained, v.actual
+    FROM counted m, recounted r,
+    LATERAL (VALUES
+        ('total_students', m.total_students::NUMERIC, r.total_students::NUMERIC),
+        ('total_teachers', m.total_teachers::NUMERIC, r.total_teachers::NUMERIC),
+        ('total_courses', m.total_courses::NUMERIC, r.total_courses::NUMERIC),
+        ('score_sum', m.score_sum, r.score_sum),
+        ('score_count', m.score_count::NUMERIC, r.score_count::NUMERIC)
+    ) AS v(metric, maintained, actual)
+    WHERE v.maintained IS DISTINCT FROM v.actual
+    UNION ALL
+    SELECT
+        'class:' || COALESCE(cs.class, s.class)::TEXT,
+        COALESCE(cs.student_count, 0)::NUMERIC,
+        COALESCE(s.student_count, 0)::NUMERIC
+    FROM class_statistics cs
+    FULL JOIN (
+        SELECT st.class, COUNT(*) AS student_count FROM students st GROUP BY st.class
+    ) s ON s.class = cs.class
+    WHERE COALESCE(cs.student_count, 0) <> COALESCE(s.student_count, 0);
 END;
 $$ LANGUAGE plpgsql;
 
@@ -567,6 +883,181 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE PROCEDURE update_user_password(
+    p_username VARCHAR,
+    p_password_hash TEXT
+) AS $$
+BEGIN
+    UPDATE users
+    SET password_hash = p_password_hash
+    WHERE username = p_username;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE PROCEDURE rebuild_statistics()
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    LOCK TABLE students, teachers, courses, course_choosing IN SHARE MODE;
+
+    UPDATE statistics_counters
+    SET total_students = 0,
+        total_teachers = 0,
+        total_courses = 0,
+        score_sum = 0,
+        score_count = 0;
+
+    UPDATE statistics_counters
+    SET total_students = (SELECT COUNT(*) FROM students),
+        total_teachers = (SELECT COUNT(*) FROM teachers),
+        total_courses = (SELECT COUNT(*) FROM courses),
+        score_sum = (SELECT COALESCE(SUM(score), 0) FROM course_choosing),
+        score_count = (SELECT COUNT(score) FROM course_choosing)
+    WHERE slot = 0;
+
+    DELETE FROM class_statistics;
+    INSERT INTO class_statistics (class, student_count)
+    SELECT class, COUNT(*) FROM students GROUP BY class;
+END;
+$$;
+
+-- STATISTICS TRIGGERS
+
+CREATE OR REPLACE FUNCTION statistics_slot()
+RETURNS SMALLINT AS $$
+    SELECT (pg_backend_pid() % 16)::SMALLINT;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION track_student_statistics()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO class_statistics (class, student_count)
+        SELECT n.class, COUNT(*) FROM new_rows n GROUP BY n.class
+        ON CONFLICT (class) DO UPDATE
+        SET student_count = class_statistics.student_count + EXCLUDED.student_count;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE class_statistics cs
+        SET student_count = cs.student_count - o.student_count
+        FROM (SELECT o.class, COUNT(*) AS student_count FROM old_rows o GROUP BY o.class) o
+        WHERE cs.class = o.class;
+
+        DELETE FROM class_statistics WHERE student_count <= 0;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        UPDATE statistics_counters
+        SET total_students = total_students + (SELECT COUNT(*) FROM new_rows)
+        WHERE slot = statistics_slot();
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE statistics_counters
+        SET total_students = total_students - (SELECT COUNT(*) FROM old_rows)
+        WHERE slot = statistics_slot();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER students_statistics_insert
+AFTER INSERT ON students
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_student_statistics();
+
+CREATE TRIGGER students_statistics_update
+AFTER UPDATE ON students
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_student_statistics();
+
+CREATE TRIGGER students_statistics_delete
+AFTER DELETE ON students
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_student_statistics();
+
+CREATE OR REPLACE FUNCTION track_row_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format(
+            'UPDATE statistics_counters SET %1$I = %1$I + (SELECT COUNT(*) FROM new_rows) WHERE slot = statistics_slot()',
+            TG_ARGV[0]
+        );
+    ELSE
+        EXECUTE format(
+            'UPDATE statistics_counters SET %1$I = %1$I - (SELECT COUNT(*) FROM old_rows) WHERE slot = statistics_slot()',
+            TG_ARGV[0]
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER teachers_statistics_insert
+AFTER INSERT ON teachers
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_row_count('total_teachers');
+
+CREATE TRIGGER teachers_statistics_delete
+AFTER DELETE ON teachers
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_row_count('total_teachers');
+
+CREATE TRIGGER courses_statistics_insert
+AFTER INSERT ON courses
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_row_count('total_courses');
+
+CREATE TRIGGER courses_statistics_delete
+AFTER DELETE ON courses
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_row_count('total_courses');
+
+CREATE OR REPLACE FUNCTION track_score_statistics()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_sum NUMERIC := 0;
+    v_count BIGINT := 0;
+    v_old_sum NUMERIC;
+    v_old_count BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COALESCE(SUM(n.score), 0), COUNT(n.score) INTO v_sum, v_count FROM new_rows n;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COALESCE(SUM(o.score), 0), COUNT(o.score) INTO v_old_sum, v_old_count FROM old_rows o;
+        v_sum := v_sum - v_old_sum;
+        v_count := v_count - v_old_count;
+    END IF;
+
+    IF v_sum <> 0 OR v_count <> 0 THEN
+        UPDATE statistics_counters
+        SET score_sum = score_sum + v_sum,
+            score_count = score_count + v_count
+        WHERE slot = statistics_slot();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER course_choosing_statistics_insert
+AFTER INSERT ON course_choosing
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_score_statistics();
+
+CREATE TRIGGER course_choosing_statistics_update
+AFTER UPDATE ON course_choosing
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_score_statistics();
+
+CREATE TRIGGER course_choosing_statistics_delete
+AFTER DELETE ON course_choosing
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION track_score_statistics();
+
 -- FILLING
 
 SELECT * FROM insert_teacher('Dr. John Smith');
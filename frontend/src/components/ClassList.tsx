@@ -1,8 +1,5 @@
-import React, { useEffect, useState, useMemo } from "react";
+import React, { useState, useMemo } from "react";
 import { Search, Users } from "lucide-react";
-import { getAverageScore } from "../utils/Fetches";
-import { LoadingSpinner } from "../components/LoadingSpinner";
-import { showError } from "../utils/toast";
 import {
     SearchBarProps,
     ClassCardProps,
@@ -43,9 +40,7 @@ export const ClassCard: React.FC<ClassCardProps> = ({
                 </p>
                 <p className="text-sm text-neutral-500 dark:text-neutral-400 mt-1">
                     Avg. score:{" "}
-                    {averageScore !== undefined
-                        ? averageScore.toFixed(2)
-                        : "..."}
+                    {averageScore !== null ? averageScore.toFixed(2) : "—"}
                 </p>
             </div>
         </div>
@@ -64,87 +59,37 @@ export const ClassCard: React.FC<ClassCardProps> = ({
 
 export const ClassGrid: React.FC<ClassGridProps> = ({
     classes,
-    students,
-    averageScores,
-    isLoading,
     onViewStudents,
-}) => {
-    if (isLoading) return <LoadingSpinner />;
-
-    return (
-        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-            {classes.map((className) => {
-                const studentCount = students.filter(
-                    (s) => s.studentClass === className
-                ).length;
-                const averageScore = averageScores[className];
-
-                return (
-                    <ClassCard
-                        key={className}
-                        className={className}
-                        studentCount={studentCount}
-                        averageScore={averageScore}
-                        onViewStudents={() => onViewStudents(className)}
-                    />
-                );
-            })}
-        </div>
-    );
-};
+}) => (
+    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+        {classes.map((summary) => (
+            <ClassCard
+                key={summary.className}
+                className={summary.className}
+                studentCount={summary.studentCount}
+                averageScore={summary.averageScore}
+                onViewStudents={() => onViewStudents(summary.className)}
+            />
+        ))}
+    </div>
+);
 
 export const ClassList: React.FC<ClassListProps> = ({
-    students,
+    classes,
     onViewStudents,
 }) => {
     const [searchTerm, setSearchTerm] = useState("");
-    const [averageScores, setAverageScores] = useState<Record<string, number>>(
-        {}
-    );
-    const [isLoading, setIsLoading] = useState(true);
-
-    const classes = useMemo(
-        () => Array.from(new Set(students.map((s) => s.studentClass))),
-        [students]
-    );
 
     const filteredClasses = useMemo(
         () =>
-            classes.filter((className) =>
-                className.toLowerCase().includes(searchTerm.toLowerCase())
+            classes.filter((summary) =>
+                summary.className
+                    .toLowerCase()
+                    .includes(searchTerm.toLowerCase())
             ),
         [classes, searchTerm]
     );
 
-    useEffect(() => {
-        const fetchAverages = async () => {
-            setIsLoading(true);
-            const scores: Record<string, number> = {};
-
-            try {
-                await Promise.all(
-                    classes.map(async (className) => {
-                        try {
-                            const avg = await getAverageScore(className);
-                            scores[className] = avg;
-                        } catch (error) {
-                            showError(
-                                error instanceof Error
-                                    ? error.message
-                                    : "Failed to fetch averages"
-                            );
-                        }
-                    })
-                );
-            } finally {
-                setAverageScores(scores);
-                setIsLoading(false);
-            }
-        };
-
-        fetchAverages();
-    }, [classes]);
-
     return (
         <div className="bg-white dark:bg-neutral-800 rounded-xl shadow-sm">
             <div className="p-6 border-b border-neutral-200 dark:border-neutral-700">
@@ -157,9 +102,6 @@ export const ClassList: React.FC<ClassListProps> = ({
             <div className="p-6">
                 <ClassGrid
                     classes={filteredClasses}
-                    students={students}
-                    averageScores={averageScores}
-                    isLoading={isLoading}
                     onViewStudents={onViewStudents}
                 />
             </div>
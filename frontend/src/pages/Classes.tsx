@@ -1,8 +1,8 @@
 import { useEffect, useState } from "react";
 import { ClassList } from "../components/ClassList";
 import { StudentList } from "../components/student/StudentList";
-import { getStudents } from "../utils/Fetches";
-import type { Student } from "../types";
+import { getClassDetails, getClasses } from "../utils/Fetches";
+import type { ClassSummary, Student } from "../types";
 import { Link } from "react-router-dom";
 import { Users } from "lucide-react";
 import { LoadingSpinner } from "../components/LoadingSpinner";
@@ -19,52 +19,76 @@ const ViewAllStudentsButton = () => (
     </Link>
 );
 
-const StudentsModal = ({
-    selectedClass,
-    students,
-    onClose,
-}: StudentsModalProps) => (
-    <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center p-4 z-50">
-        <div className="bg-white dark:bg-neutral-800 rounded-xl p-6 max-w-4xl w-full max-h-[90vh] overflow-y-auto">
-            <div className="flex justify-between items-center mb-6">
-                <h2 className="text-2xl font-bold text-neutral-900 dark:text-white">
-                    Students in {selectedClass}
-                </h2>
-                <button
-                    onClick={onClose}
-                    className="text-neutral-500 hover:text-neutral-700 dark:text-neutral-400 dark:hover:text-neutral-200 text-2xl"
-                >
-                    ×
-                </button>
+const StudentsModal = ({ selectedClass, onClose }: StudentsModalProps) => {
+    const [students, setStudents] = useState<Student[]>([]);
+    const [isLoading, setIsLoading] = useState(true);
+
+    useEffect(() => {
+        const fetchClass = async () => {
+            setIsLoading(true);
+            try {
+                const data = await getClassDetails(selectedClass);
+                setStudents(data.students);
+            } catch (err) {
+                showError(
+                    err instanceof Error
+                        ? err.message
+                        : "Failed to fetch class students"
+                );
+            } finally {
+                setIsLoading(false);
+            }
+        };
+        fetchClass();
+    }, [selectedClass]);
+
+    return (
+        <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center p-4 z-50">
+            <div className="bg-white dark:bg-neutral-800 rounded-xl p-6 max-w-4xl w-full max-h-[90vh] overflow-y-auto">
+                <div className="flex justify-between items-center mb-6">
+                    <h2 className="text-2xl font-bold text-neutral-900 dark:text-white">
+                        Students in {selectedClass}
+                    </h2>
+                    <button
+                        onClick={onClose}
+                        className="text-neutral-500 hover:text-neutral-700 dark:text-neutral-400 dark:hover:text-neutral-200 text-2xl"
+                    >
+                        ×
+                    </button>
+                </div>
+                {isLoading ? (
+                    <LoadingSpinner />
+                ) : (
+                    <StudentList students={students} />
+                )}
             </div>
-            <StudentList students={students} />
         </div>
-    </div>
-);
+    );
+};
 
 export const ClassesPage = () => {
-    const [students, setStudents] = useState<Student[]>([]);
+    const [classes, setClasses] = useState<ClassSummary[]>([]);
     const [isLoading, setIsLoading] = useState(true);
     const [selectedClass, setSelectedClass] = useState<string | null>(null);
     const [isStudentsOpen, setIsStudentsOpen] = useState(false);
 
     useEffect(() => {
-        const fetchStudents = async () => {
+        const fetchClasses = async () => {
             setIsLoading(true);
             try {
-                const data = await getStudents();
-                setStudents(data);
+                const data = await getClasses();
+                setClasses(data);
             } catch (err) {
                 showError(
                     err instanceof Error
                         ? err.message
-                        : "Failed to fetch students"
+                        : "Failed to fetch classes"
                 );
             } finally {
                 setIsLoading(false);
             }
         };
-        fetchStudents();
+        fetchClasses();
     }, []);
 
     const handleViewStudents = (className: string) => {
@@ -74,10 +98,6 @@ export const ClassesPage = () => {
 
     const handleCloseModal = () => setIsStudentsOpen(false);
 
-    const classStudents = selectedClass
-        ? students.filter((student) => student.studentClass === selectedClass)
-        : [];
-
     return (
         <div className="space-y-6">
             <div className="flex justify-between items-center">
@@ -89,14 +109,13 @@ export const ClassesPage = () => {
             {!isLoading && (
                 <>
                     <ClassList
-                        students={students}
+                        classes={classes}
                         onViewStudents={handleViewStudents}
                     />
 
                     {isStudentsOpen && selectedClass && (
                         <StudentsModal
                             selectedClass={selectedClass}
-                            students={classStudents}
                             onClose={handleCloseModal}
                         />
                     )}
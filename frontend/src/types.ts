@@ -51,10 +51,17 @@ export interface User {
     teacher_id?: string;
 }
 
-export interface ClassInfo {
+export interface ClassSummary {
     className: string;
+    studentCount: number;
+    averageScore: number | null;
+    minScore: number | null;
+    maxScore: number | null;
+    enrollmentCount: number;
+}
+
+export interface ClassInfo extends ClassSummary {
     students: Student[];
-    averageScore: number;
 }
 
 export interface StudentWithScore extends Student {
@@ -159,20 +166,17 @@ export interface SearchBarProps {
 export interface ClassCardProps {
     className: string;
     studentCount: number;
-    averageScore?: number;
+    averageScore: number | null;
     onViewStudents: () => void;
 }
 
 export interface ClassGridProps {
-    classes: string[];
-    students: Student[];
-    averageScores: Record<string, number>;
-    isLoading: boolean;
+    classes: ClassSummary[];
     onViewStudents: (className: string) => void;
 }
 
 export interface ClassListProps {
-    students: Student[];
+    classes: ClassSummary[];
     onViewStudents: (className: string) => void;
 }
 
@@ -197,7 +201,6 @@ export interface ThemeContextType {
 
 export interface StudentsModalProps {
     selectedClass: string;
-    students: Student[];
     onClose: () => void;
 }
 
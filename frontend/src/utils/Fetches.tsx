@@ -1,4 +1,6 @@
 import type {
+    ClassInfo,
+    ClassSummary,
     Student,
     Course,
     CourseChoice,
@@ -9,6 +11,15 @@ import type {
 
 const API_URL = "/api";
 
+const apiFetch = (url: string, init: RequestInit = {}) => {
+    const token = localStorage.getItem("token");
+    const headers = new Headers(init.headers);
+    if (token) {
+        headers.set("Authorization", `Bearer ${token}`);
+    }
+    return fetch(url, { ...init, headers });
+};
+
 const handleResponse = async (response: Response) => {
     if (!response.ok) {
         const errorData = await response.json().catch(() => ({
@@ -20,7 +31,7 @@ const handleResponse = async (response: Response) => {
 };
 
 export const getStudents = async (): Promise<Student[]> => {
-    const response = await fetch(`${API_URL}/students`);
+    const response = await apiFetch(`${API_URL}/students`);
     const data = await handleResponse(response);
     return data;
 };
@@ -28,13 +39,13 @@ export const getStudents = async (): Promise<Student[]> => {
 export const getStudentsByCourse = async (
     courseId: string
 ): Promise<StudentWithScore[]> => {
-    const response = await fetch(`${API_URL}/courses/${courseId}/students`);
+    const response = await apiFetch(`${API_URL}/courses/${courseId}/students`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const addStudent = async (student: Student): Promise<void> => {
-    const response = await fetch(`${API_URL}/students/new`, {
+    const response = await apiFetch(`${API_URL}/students/new`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(student),
@@ -47,7 +58,7 @@ export const addStudent = async (student: Student): Promise<void> => {
 };
 
 export const updateStudent = async (student: Student): Promise<void> => {
-    const response = await fetch(`${API_URL}/students/${student.id}`, {
+    const response = await apiFetch(`${API_URL}/students/${student.id}`, {
         method: "PUT",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(student),
@@ -59,7 +70,7 @@ export const updateStudent = async (student: Student): Promise<void> => {
 };
 
 export const deleteStudent = async (id: string): Promise<void> => {
-    const response = await fetch(`${API_URL}/students/${id}`, {
+    const response = await apiFetch(`${API_URL}/students/${id}`, {
         method: "DELETE",
     });
     if (!response.ok) {
@@ -69,20 +80,20 @@ export const deleteStudent = async (id: string): Promise<void> => {
 };
 
 export const getStudentDetails = async (id: string) => {
-    const response = await fetch(`${API_URL}/students/${id}`);
+    const response = await apiFetch(`${API_URL}/students/${id}`);
     const data = await handleResponse(response);
     return data;
 };
 
 // Teachers API
 export const getTeachers = async (): Promise<Teacher[]> => {
-    const response = await fetch(`${API_URL}/teachers`);
+    const response = await apiFetch(`${API_URL}/teachers`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const addTeacher = async (teacher: Teacher): Promise<void> => {
-    const response = await fetch(`${API_URL}/teachers/new`, {
+    const response = await apiFetch(`${API_URL}/teachers/new`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(teacher),
@@ -95,7 +106,7 @@ export const addTeacher = async (teacher: Teacher): Promise<void> => {
 };
 
 export const updateTeacher = async (teacher: Teacher): Promise<void> => {
-    const response = await fetch(`${API_URL}/teachers/${teacher.id}`, {
+    const response = await apiFetch(`${API_URL}/teachers/${teacher.id}`, {
         method: "PUT",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(teacher),
@@ -107,7 +118,7 @@ export const updateTeacher = async (teacher: Teacher): Promise<void> => {
 };
 
 export const deleteTeacher = async (id: string): Promise<void> => {
-    const response = await fetch(`${API_URL}/teachers/${id}`, {
+    const response = await apiFetch(`${API_URL}/teachers/${id}`, {
         method: "DELETE",
     });
     if (!response.ok) {
@@ -117,25 +128,25 @@ export const deleteTeacher = async (id: string): Promise<void> => {
 };
 
 export const getTeacherDetails = async (id: string) => {
-    const response = await fetch(`${API_URL}/teachers/${id}`);
+    const response = await apiFetch(`${API_URL}/teachers/${id}`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const getTeacherInfo = async (id: string) => {
-    const response = await fetch(`${API_URL}/teachers/details/${id}`);
+    const response = await apiFetch(`${API_URL}/teachers/details/${id}`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const getCourses = async (): Promise<Course[]> => {
-    const response = await fetch(`${API_URL}/courses`);
+    const response = await apiFetch(`${API_URL}/courses`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const addCourse = async (course: Course): Promise<void> => {
-    const response = await fetch(`${API_URL}/courses/new`, {
+    const response = await apiFetch(`${API_URL}/courses/new`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(course),
@@ -147,7 +158,7 @@ export const addCourse = async (course: Course): Promise<void> => {
 };
 
 export const updateCourse = async (course: Course): Promise<void> => {
-    const response = await fetch(`${API_URL}/courses/${course.id}`, {
+    const response = await apiFetch(`${API_URL}/courses/${course.id}`, {
         method: "PUT",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(course),
@@ -159,7 +170,7 @@ export const updateCourse = async (course: Course): Promise<void> => {
 };
 
 export const deleteCourse = async (id: string): Promise<void> => {
-    const response = await fetch(`${API_URL}/courses/${id}`, {
+    const response = await apiFetch(`${API_URL}/courses/${id}`, {
         method: "DELETE",
     });
     if (!response.ok) {
@@ -169,7 +180,7 @@ export const deleteCourse = async (id: string): Promise<void> => {
 };
 
 export const getCourseDetails = async (id: string) => {
-    const response = await fetch(`${API_URL}/courses/${id}`);
+    const response = await apiFetch(`${API_URL}/courses/${id}`);
     const data = await handleResponse(response);
     return data;
 };
@@ -177,7 +188,7 @@ export const getCourseDetails = async (id: string) => {
 export const addCourseChoice = async (
     courseChoice: CourseChoice
 ): Promise<CourseChoice> => {
-    const response = await fetch(`${API_URL}/course-choices`, {
+    const response = await apiFetch(`${API_URL}/course-choices`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(courseChoice),
@@ -190,7 +201,7 @@ export const updateCourseChoice = async (
     student_id: string,
     courseChoice: string[]
 ): Promise<void> => {
-    const response = await fetch(
+    const response = await apiFetch(
         `${API_URL}/students/course-choice/${student_id}`,
         {
             method: "PUT",
@@ -209,7 +220,7 @@ export const updateCourseScore = async (
     courseId: string,
     score: number
 ): Promise<void> => {
-    const response = await fetch(
+    const response = await apiFetch(
         `${API_URL}/students/course-choice/${studentId}/${courseId}/${score}`,
         {
             method: "PUT",
@@ -224,7 +235,7 @@ export const updateCourseScore = async (
 export const getChosenCourses = async (
     studentId: string
 ): Promise<ChosenCourse[]> => {
-    const response = await fetch(
+    const response = await apiFetch(
         `${API_URL}/students/course-choice/${studentId}`
     );
     const data = await handleResponse(response);
@@ -233,25 +244,41 @@ export const getChosenCourses = async (
 
 // Statistics API
 export const getClassStatistics = async (className: string) => {
-    const response = await fetch(`${API_URL}/statistics/class/${className}`);
+    const response = await apiFetch(`${API_URL}/statistics/class/${className}`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const getCourseStatistics = async (courseId: string) => {
-    const response = await fetch(`${API_URL}/statistics/course/${courseId}`);
+    const response = await apiFetch(`${API_URL}/statistics/course/${courseId}`);
     const data = await handleResponse(response);
     return data;
 };
 
 export const getGlobalStatistics = async () => {
-    const response = await fetch(`${API_URL}/statistics`);
+    const response = await apiFetch(`${API_URL}/statistics`);
+    const data = await handleResponse(response);
+    return data;
+};
+
+export const getClasses = async (): Promise<ClassSummary[]> => {
+    const response = await apiFetch(`${API_URL}/class`);
+    const data = await handleResponse(response);
+    return data;
+};
+
+export const getClassDetails = async (
+    className: string
+): Promise<ClassInfo> => {
+    const response = await apiFetch(
+        `${API_URL}/class/${encodeURIComponent(className)}/details`
+    );
     const data = await handleResponse(response);
     return data;
 };
 
 export const getAverageScore = async (className: string): Promise<number> => {
-    const response = await fetch(`${API_URL}/class/${className}`);
+    const response = await apiFetch(`${API_URL}/class/${className}`);
     const data = await handleResponse(response);
     return data;
 };
@@ -260,7 +287,7 @@ export const login = async (
     username: string,
     password: string
 ): Promise<{ token: string }> => {
-    const response = await fetch(`${API_URL}/auth/login`, {
+    const response = await apiFetch(`${API_URL}/auth/login`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ username, password }),
@@ -284,7 +311,7 @@ export const register = async (
     if (role == "teacher" && !teacher_id) {
         role = "admin";
     }
-    const response = await fetch(`${API_URL}/auth/register`, {
+    const response = await apiFetch(`${API_URL}/auth/register`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({